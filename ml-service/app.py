@@ -12,31 +12,166 @@ This service:
 """
 
 import os
+
+# Size the intra-op thread pools before numpy/torch are imported: every worker
+# process gets an equal share of the cores (WEB_CONCURRENCY is the worker count),
+# otherwise concurrent workers oversubscribe the CPU and contend for it
+_WORKER_COUNT = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+_THREADS_PER_WORKER = max(1, (os.cpu_count() or 1) // _WORKER_COUNT)
+os.environ.setdefault('OMP_NUM_THREADS', str(_THREADS_PER_WORKER))
+os.environ.setdefault('MKL_NUM_THREADS', str(_THREADS_PER_WORKER))
+
 import time
+import queue
+import atexit
+import threading
 import numpy as np
+import torch
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 
 # Import our modules
 from model_loader import (
     get_pipeline, is_model_loaded, load_model, get_model_info,
-    get_audio_pipeline, is_audio_model_loaded, load_audio_model
+    get_audio_pipeline, is_audio_model_loaded, load_audio_model,
+    inference_context, is_model_compiled, warmup_model,
+    get_device, get_model_backend, get_fake_label_index, get_audio_label_table
+)
+from preprocessing import (
+    preprocess_image, preprocess_frames, preprocess_video, preprocess_frame_array, sample_frame_paths,
+    iter_preprocessed_frames, warmup_face_detection, configure_target_size, get_preprocessing_signature,
+    FRAME_SIMILARITY_THRESHOLD
 )
-from preprocessing import preprocess_image, preprocess_frames
+from gpu_preprocessing import preprocess_frames_gpu, images_to_pixel_values, is_gpu_decode_available
 from audio_preprocessing import preprocess_audio, is_audio_processing_available
+from batching import BatchScheduler
+from frame_cache import is_frame_cache_enabled, load_frames, save_frames
+
+# Try to import orjson - falls back to Flask's stdlib json provider if not available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (C serializer, handles NumPy scalars/arrays)"""
+
+    option = orjson.OPT_SERIALIZE_NUMPY if ORJSON_AVAILABLE else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Write the serialized bytes straight into the response (no str round-trip)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 
 app = Flask(__name__)
+if ORJSON_AVAILABLE:
+    app.json = ORJSONProvider(app)
 CORS(app)
 
-logging.basicConfig(level=logging.INFO)
+_log_listener = None
+
+
+def configure_logging():
+    """
+    Route log records through a queue drained by a background thread
+
+    Request threads only enqueue records; formatting and the stream write happen
+    on the listener thread. Called again in each forked gunicorn worker, since
+    the listener thread does not survive fork.
+    """
+    global _log_listener
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    queue_handler = QueueHandler(log_queue)
+    # QueueHandler merges args into the message; the stream handler adds level/name
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler], force=True)
+    _log_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _log_listener.start()
+
+
+def _stop_log_listener():
+    """Flush queued log records on shutdown"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+configure_logging()
+atexit.register(_stop_log_listener)
 logger = logging.getLogger(__name__)
 
 # Global model status
 _model_loaded = False
 
 
+def configure_torch_threads():
+    """
+    Pin torch intra-op threads to this worker's share of the cores
+
+    On GPU hosts the CPU mostly runs preprocessing, so torch gets half the share.
+    TORCH_NUM_THREADS overrides the computed value.
+    """
+    num_threads = _THREADS_PER_WORKER
+    if torch.cuda.is_available():
+        num_threads = max(1, num_threads // 2)
+    num_threads = int(os.environ.get('TORCH_NUM_THREADS', num_threads))
+
+    torch.set_num_threads(num_threads)
+    try:
+        # Only allowed before any inter-op parallel work has started
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+    logger.info(f'[ML_SERVICE] Torch threads: intra-op={num_threads}, workers={_WORKER_COUNT}')
+
+
+configure_torch_threads()
+
+# Number of images per forward pass (VIDEO frames are packed into batches of this size)
+INFERENCE_BATCH_SIZE = int(os.environ.get('INFERENCE_BATCH_SIZE', 16))
+
+# Frames analysed per video (sampled evenly over its whole length)
+MAX_FRAMES = int(os.environ.get('MAX_FRAMES', 30))
+
+# Maximum time a request waits for concurrent (still preprocessing) requests to join its batch
+BATCH_MAX_LATENCY_MS = float(os.environ.get('BATCH_MAX_LATENCY_MS', 50))
+
+# Content-addressed result cache: (hash, model version, media type) -> response
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 1024))
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+# CUDA streams for overlapping host-to-device copies with compute (created lazily)
+_copy_stream = None
+_compute_stream = None
+
+# Frame decoding + face detection run in parallel on this pool (off the request thread);
+# each worker thread builds and warms its own face detector when it starts
+_preprocess_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix='preprocess', initializer=warmup_face_detection
+)
+
+# Audio tracks of videos are analysed here, in parallel with the frame pipeline
+_audio_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='audio')
+
+
 def load_model_on_startup():
     """Load models when service starts (image and audio)"""
     global _model_loaded
@@ -47,13 +182,47 @@ def load_model_on_startup():
         load_model()
         _model_loaded = True
         logger.info('[ML_SERVICE] Image model loaded successfully')
+        # Warm up on the batch scheduler's worker - the thread every forward pass runs
+        # on (inductor's CUDA graph trees are recorded per thread)
+        warmup_model(INFERENCE_BATCH_SIZE, forward_fn=_batch_scheduler.submit)
+        configure_target_size(get_pipeline().image_processor)
     except Exception as e:
         logger.error(f'[ML_SERVICE] Failed to load image model: {str(e)}', exc_info=True)
         _model_loaded = False
 
-    # Audio model loads lazily on first use (to not block server startup)
-    # This allows the service to be healthy immediately
-    logger.info('[ML_SERVICE] Audio model will load lazily on first audio request')
+    # Pick the face detection method (downloading the DNN model if needed) now
+    # rather than on the first request
+    warmup_face_detection()
+
+    # Audio model loads in a background thread (to not block server startup)
+    # This allows the service to be healthy immediately. A preloading gunicorn
+    # master loads it inline instead, so forked workers inherit it - a loader
+    # thread would not survive fork.
+    if os.environ.get('GUNICORN_PRELOAD') == 'true':
+        load_audio_model()
+    else:
+        logger.info('[ML_SERVICE] Loading audio model in the background...')
+        threading.Thread(target=load_audio_model, name='audio-model-loader', daemon=True).start()
+
+
+def get_cached_result(key):
+    """Get a cached inference response (marks it most recently used) or None"""
+    with _result_cache_lock:
+        response = _result_cache.get(key)
+        if response is not None:
+            _result_cache.move_to_end(key)
+        return response
+
+
+def cache_result(key, response):
+    """Store an inference response, evicting the least recently used entry when full"""
+    if RESULT_CACHE_SIZE <= 0:
+        return
+    with _result_cache_lock:
+        _result_cache[key] = response
+        _result_cache.move_to_end(key)
+        while len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
 
 
 def extract_fake_probability(result):
@@ -109,6 +278,15 @@ def extract_audio_fake_probability(result):
         Float probability that audio is fake (0-1)
     """
     try:
+        label_table = get_audio_label_table()
+        if isinstance(result, list) and label_table:
+            # Labels were classified once at load time - plain dict lookups
+            for item in result:
+                is_fake = label_table.get(item.get('label'))
+                if is_fake is not None:
+                    score = item.get('score', 0.0)
+                    return score if is_fake else 1.0 - score
+
         if isinstance(result, list):
             for item in result:
                 label = item.get('label', '').lower()
@@ -166,7 +344,8 @@ def run_audio_inference(audio_data):
         }
 
         # Run inference
-        raw_result = audio_pipeline(audio_input)
+        with inference_context():
+            raw_result = audio_pipeline(audio_input)
 
         # Extract fake probability
         fake_prob = extract_audio_fake_probability(raw_result)
@@ -180,52 +359,362 @@ def run_audio_inference(audio_data):
         return None, None
 
 
-def run_inference(pipeline, images):
+def analyze_audio_track(audio_path):
     """
-    Run inference on preprocessed images using pipeline
+    Preprocess and classify the audio track of a video
+
+    Args:
+        audio_path: Path to the extracted audio file
+
+    Returns:
+        Audio fake probability (0-1) or None if audio could not be analysed
+    """
+    if not os.path.exists(audio_path):
+        logger.info(f'[ML_SERVICE] Audio track not found: {audio_path}')
+        return None
+
+    logger.info(f'[ML_SERVICE] Processing audio track: {audio_path}')
+
+    if not (is_audio_model_loaded() and is_audio_processing_available()):
+        logger.info('[ML_SERVICE] Audio model not available, skipping audio analysis')
+        return None
+
+    audio_data = preprocess_audio(audio_path)
+    if not audio_data['valid']:
+        logger.warning(f'[ML_SERVICE] Audio preprocessing failed: {audio_data.get("error")}')
+        return None
+
+    audio_fake_prob, _ = run_audio_inference(audio_data)
+    if audio_fake_prob is not None:
+        logger.info(f'[ML_SERVICE] Audio analysis complete: fake_prob={audio_fake_prob:.4f}')
+    else:
+        logger.warning('[ML_SERVICE] Audio inference returned None')
+    return audio_fake_prob
+
+
+def _get_cuda_streams():
+    """Get the (copy, compute) CUDA stream pair, creating it on first use"""
+    global _copy_stream, _compute_stream
+    if _copy_stream is None:
+        _copy_stream = torch.cuda.Stream()
+        _compute_stream = torch.cuda.Stream()
+    return _copy_stream, _compute_stream
+
+
+def _forward_streamed(pipeline, images, batch_size):
+    """
+    Run batched forward passes with host-to-device copies overlapped against compute
+
+    Fallback for CUDA hosts where images_to_pixel_values cannot build the batch
+    on the GPU (see run_inference). While batch k runs on the compute stream,
+    batch k+1 is preprocessed on the CPU and uploaded from pinned memory on the
+    copy stream. Outputs stay on the GPU until every batch has been issued, then
+    come back in a single copy.
+
+    Args:
+        pipeline: Loaded pipeline (PyTorch backend on CUDA)
+        images: List of PIL Images
+        batch_size: Number of images per forward pass
+
+    Returns:
+        float32 tensor of fake probabilities (see _logits_to_probs) on the GPU
+    """
+    copy_stream, compute_stream = _get_cuda_streams()
+    model = pipeline.model
+    device = model.device
+    chunks = [images[i:i + batch_size] for i in range(0, len(images), batch_size)]
+
+    def upload(chunk):
+        pixel_values = pipeline.image_processor(chunk, return_tensors='pt')['pixel_values'].pin_memory()
+        with torch.cuda.stream(copy_stream):
+            pixel_values_gpu = pixel_values.to(device, non_blocking=True)
+            copied = torch.cuda.Event()
+            copied.record(copy_stream)
+        return pixel_values_gpu, copied
+
+    outputs = []
+    next_batch = upload(chunks[0])
+    for k in range(len(chunks)):
+        pixel_values_gpu, copied = next_batch
+
+        with torch.cuda.stream(compute_stream):
+            compute_stream.wait_event(copied)
+            pixel_values_gpu.record_stream(compute_stream)
+            logits = model(pixel_values=pixel_values_gpu.to(dtype=model.dtype, memory_format=torch.channels_last)).logits
+            outputs.append(_logits_to_probs(logits))
+
+        # Prepare and upload the next batch while this one computes
+        if k + 1 < len(chunks):
+            next_batch = upload(chunks[k + 1])
+
+    compute_stream.synchronize()
+    return torch.cat(outputs)
+
+
+def _forward_probs(pipeline, images, batch_size):
+    """
+    Run batched forward passes straight through the model (no pipeline post-processing)
+
+    Args:
+        pipeline: Loaded pipeline
+        images: List of PIL Images
+        batch_size: Number of images per forward pass
+
+    Returns:
+        float32 tensor of fake probabilities (see _logits_to_probs)
+    """
+    model = pipeline.model
+    outputs = []
+    for start in range(0, len(images), batch_size):
+        pixel_values = pipeline.image_processor(images[start:start + batch_size], return_tensors='pt')['pixel_values']
+        if get_model_backend() == 'torch':
+            pixel_values = pixel_values.to(model.device, dtype=model.dtype, memory_format=torch.channels_last)
+        logits = model(pixel_values=pixel_values).logits
+        outputs.append(_logits_to_probs(logits))
+    return torch.cat(outputs)
+
+
+def _logits_to_probs(logits):
+    """
+    Turn a batch of logits into fake probabilities
+
+    For a two-class model the fake probability is sigmoid(fake - other), the
+    same value as the softmax column without normalizing every row.
+
+    Returns:
+        float32 tensor (N,) of fake probabilities, or (N, num_labels) class
+        probabilities if the fake class was not identified at load time
+    """
+    logits = logits.float()
+    fake_index = get_fake_label_index()
+    if fake_index is None:
+        return logits.softmax(dim=-1)
+    if logits.shape[-1] == 2:
+        return torch.sigmoid(logits[:, fake_index] - logits[:, 1 - fake_index])
+    return logits.softmax(dim=-1)[:, fake_index]
+
+
+def _probs_to_fake_probs(probs, id2label):
+    """
+    Convert the output of _logits_to_probs to a numpy array of fake probabilities
+
+    Falls back to per-result label matching if the label table did not
+    identify the fake class at load time.
+    """
+    if probs.dim() == 1:
+        return probs.cpu().numpy()
+    return np.array([extract_fake_probability(result) for result in _probs_to_results(probs, id2label)])
+
+
+def _probs_to_results(probs, id2label):
+    """Convert a (N, num_labels) probability tensor to pipeline-style {label, score} lists"""
+    return [
+        sorted(
+            ({'label': id2label[i], 'score': score} for i, score in enumerate(row)),
+            key=lambda item: item['score'],
+            reverse=True
+        )
+        for row in probs.cpu().tolist()
+    ]
+
+
+def run_inference_tensor(pipeline, pixel_values, batch_size=INFERENCE_BATCH_SIZE):
+    """
+    Run inference on pixel values that were already preprocessed
+
+    Args:
+        pipeline: Loaded pipeline
+        pixel_values: float tensor (N, 3, H, W) on any device / in any float dtype
+        batch_size: Number of images per forward pass
+
+    Returns:
+        numpy array of fake probabilities (one per image)
+    """
+    try:
+        model = pipeline.model
+        outputs = []
+        with inference_context():
+            if get_model_backend() == 'torch':
+                # Match the device, dtype and channels_last layout of the model. The copy
+                # is always made here, under inference_mode, so every batch reaches the
+                # model as an inference tensor whatever its origin (Dynamo guards on the
+                # dispatch keys too) - warmup runs through here and compiles that exact input
+                pixel_values = pixel_values.to(
+                    model.device, dtype=model.dtype, memory_format=torch.channels_last, copy=True
+                )
+            else:
+                pixel_values = pixel_values.contiguous()
+            for start in range(0, pixel_values.shape[0], batch_size):
+                chunk = pixel_values[start:start + batch_size]
+                num_images = chunk.shape[0]
+                if is_model_compiled() and 1 < num_images < batch_size:
+                    # Keep a static (batch_size, 3, H, W) shape so the compiled
+                    # CUDA graph is replayed instead of re-captured (a single
+                    # image runs as is - batch 1 is the other warmed-up shape)
+                    padded = chunk.new_zeros((batch_size, *chunk.shape[1:])).contiguous(memory_format=torch.channels_last)
+                    padded[:num_images].copy_(chunk)
+                    chunk = padded
+                logits = model(pixel_values=chunk).logits[:num_images]
+                outputs.append(_logits_to_probs(logits))
+
+        return _probs_to_fake_probs(torch.cat(outputs), model.config.id2label)
+
+    except Exception as e:
+        logger.error(f'[ML_SERVICE] Model inference error: {str(e)}', exc_info=True)
+        raise
+
+
+def run_inference(pipeline, images, batch_size=INFERENCE_BATCH_SIZE):
+    """
+    Run inference on preprocessed images
+
+    Images are packed into batched forward passes and the fake-class
+    probability is computed straight from the logits, without the
+    pipeline's per-image {label, score} formatting.
 
     Args:
         pipeline: Loaded pipeline
         images: List of PIL Images or single PIL Image
+        batch_size: Number of images per forward pass
 
     Returns:
-        List of predictions with probabilities
+        numpy array of fake probabilities (one per image)
     """
     try:
-        # Run inference
-        raw_results = pipeline(images)
-
-        # Normalize results to list of predictions
-        # Each prediction is a list of {label, score} dicts
-        results = []
-
-        if isinstance(raw_results, dict):
-            # Single dict result
-            results = [[raw_results]]
-        elif isinstance(raw_results, list) and len(raw_results) > 0:
-            if isinstance(raw_results[0], dict) and 'label' in raw_results[0]:
-                # Single image result: [{'label': 'Real', 'score': 0.51}, {'label': 'Fake', 'score': 0.49}]
-                results = [raw_results]
-            elif isinstance(raw_results[0], list):
-                # Batch result: [[{...}, {...}], [{...}, {...}]]
-                results = raw_results
+        if not isinstance(images, list):
+            images = [images]
+
+        num_images = len(images)
+        if num_images == 0:
+            return np.empty(0)
+
+        if is_gpu_decode_available() and get_device() >= 0 and get_model_backend() == 'torch':
+            # Upload uint8 pixels and resize/normalize on the GPU instead of in the image processor
+            pixel_values = images_to_pixel_values(
+                images, pipeline.image_processor, pipeline.model.device, dtype=pipeline.model.dtype
+            )
+            if pixel_values is not None:
+                return run_inference_tensor(pipeline, pixel_values, batch_size)
+
+        with inference_context():
+            if is_model_compiled() and num_images % batch_size > 1:
+                # Compiled graphs are specialized on static shapes - pad the
+                # final partial batch so it replays the warmed-up graph. Only
+                # batch 1 and batch_size are warmed up, so a lone image (a
+                # typical IMAGE request) runs unpadded instead of at batch_size
+                images = images + [images[-1]] * (batch_size - num_images % batch_size)
             else:
-                # Unknown format, wrap it
-                results = [raw_results]
-        else:
-            # Empty or unknown, use default
-            results = [raw_results]
+                batch_size = min(batch_size, num_images)
 
-        # Extract fake probabilities - each result is a full prediction with all labels
-        fake_probs = [extract_fake_probability(result) for result in results]
+            if len(images) > batch_size and get_device() >= 0 and get_model_backend() == 'torch':
+                # Multiple batches on GPU - overlap uploads with compute. Only reached
+                # when images_to_pixel_values above did not take over: GPU_DECODE=false,
+                # no torchvision, or a processor without a fixed height/width
+                probs = _forward_streamed(pipeline, images, batch_size)
+            else:
+                probs = _forward_probs(pipeline, images, batch_size)
 
-        return fake_probs, raw_results
+        return _probs_to_fake_probs(probs[:num_images], pipeline.model.config.id2label)
 
     except Exception as e:
         logger.error(f'[ML_SERVICE] Model inference error: {str(e)}', exc_info=True)
         raise
 
 
+def _images_to_tensor(pipeline, images):
+    """Build pixel values for PIL images (on the GPU, in the model's dtype, when possible)"""
+    if is_gpu_decode_available() and get_device() >= 0 and get_model_backend() == 'torch':
+        pixel_values = images_to_pixel_values(
+            images, pipeline.image_processor, pipeline.model.device, dtype=pipeline.model.dtype
+        )
+        if pixel_values is not None:
+            return pixel_values
+    return pipeline.image_processor(images, return_tensors='pt')['pixel_values']
+
+
+def _infer_fake_probs(items):
+    """
+    Run the image model on a coalesced batch and return one fake probability per image
+
+    Items are PIL Images or pixel-value rows (3, H, W) from requests that
+    submitted tensors (GPU-preprocessed or cached frames, warmup). A batch
+    with any tensor rows is run as one pixel-value tensor, in submission order.
+    """
+    pipeline = get_pipeline()
+    if not any(isinstance(item, torch.Tensor) for item in items):
+        return run_inference(pipeline, items)
+
+    rows = list(items)
+    image_indices = [i for i, item in enumerate(items) if not isinstance(item, torch.Tensor)]
+    if image_indices:
+        pixel_values = _images_to_tensor(pipeline, [items[i] for i in image_indices])
+        for i, row in zip(image_indices, pixel_values):
+            rows[i] = row
+
+    if get_model_backend() == 'torch':
+        device, dtype = pipeline.model.device, pipeline.model.dtype
+    else:
+        device, dtype = 'cpu', torch.float32
+    return run_inference_tensor(pipeline, torch.stack([row.to(device, dtype=dtype) for row in rows]))
+
+
+# Concurrent requests share forward passes through this scheduler
+_batch_scheduler = BatchScheduler(
+    _infer_fake_probs,
+    max_batch_size=INFERENCE_BATCH_SIZE,
+    max_latency_ms=BATCH_MAX_LATENCY_MS
+)
+
+
+def _frame_cache_signature(source):
+    """
+    Describe how a request's frames are selected and preprocessed, for frame cache keys
+
+    Args:
+        source: Where the frames come from - 'array', 'video', 'frames' or
+            'frames-gpu' (each path decodes and crops differently)
+
+    Returns:
+        str: Signature covering the source, frame sampling and preprocessing settings
+    """
+    return f'{source}|{MAX_FRAMES}|{FRAME_SIMILARITY_THRESHOLD}|{get_preprocessing_signature()}'
+
+
+def _infer_frames(images, face_flags, hash_value, model_version, signature):
+    """
+    Run the image model on preprocessed video frames
+
+    With the frame cache enabled the pixel values are built here so they can be
+    stored for later requests. Either way the frames go through the batch scheduler.
+    """
+    if not (hash_value and is_frame_cache_enabled()):
+        return _batch_scheduler.submit(images)
+
+    pixel_values = get_pipeline().image_processor(images, return_tensors='pt')['pixel_values']
+    save_frames(hash_value, model_version, pixel_values, face_flags, signature)
+    return _batch_scheduler.submit(pixel_values)
+
+
+def _aggregate_probs(probs):
+    """
+    Frame statistics over fake probabilities, as vectorized numpy reductions
+
+    Args:
+        probs: Non-empty float64 array of fake probabilities
+
+    Returns:
+        tuple: (p90, peak, mean, variance, mean absolute distance from 0.5)
+    """
+    mean = probs.mean()
+    return (
+        np.percentile(probs, 90),
+        probs.max(),
+        mean,
+        np.square(probs - mean).mean(),
+        np.abs(probs - 0.5).mean()
+    )
+
+
 def calculate_scores(fake_probs, media_type, frame_count=1, faces_detected=0, audio_fake_prob=None):
     """
     Calculate detection scores from model predictions
@@ -241,16 +730,23 @@ def calculate_scores(fake_probs, media_type, frame_count=1, faces_detected=0, au
         Dictionary of calculated scores
     """
     try:
-        fake_probs = np.array(fake_probs) if len(fake_probs) > 0 else np.array([])
+        fake_probs = np.asarray(fake_probs, dtype=np.float64)
 
+        if len(fake_probs) > 0 and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'[ML_SERVICE] Video fake probabilities: {fake_probs[:5]}...')
+
+        # All frame statistics up front
+        # (unboxed to Python floats once - everything below is plain float arithmetic)
         if len(fake_probs) > 0:
-            logger.info(f'[ML_SERVICE] Video fake probabilities: {fake_probs[:min(5, len(fake_probs))]}...')
+            p90, peak, mean, variance, mean_abs_dev = (float(value) for value in _aggregate_probs(fake_probs))
+        else:
+            p90 = peak = mean = variance = mean_abs_dev = 0.0
 
         # Calculate video scores using 90th percentile (P90) for robustness
-        if len(fake_probs) > 0 and fake_probs.max() > 0:
-            video_score = float(np.percentile(fake_probs, 90) * 100)
-            peak_risk = float(np.max(fake_probs) * 100)
-            mean_risk = float(np.mean(fake_probs) * 100)
+        if peak > 0:
+            video_score = p90 * 100
+            peak_risk = peak * 100
+            mean_risk = mean * 100
         else:
             video_score = 0.0
             peak_risk = 0.0
@@ -261,7 +757,6 @@ def calculate_scores(fake_probs, media_type, frame_count=1, faces_detected=0, au
 
         # Temporal consistency for videos
         if media_type == 'VIDEO' and len(fake_probs) > 1:
-            variance = float(np.var(fake_probs))
             # Higher variance = lower consistency
             temporal_consistency = max(0, min(100, 100 - (variance * 1000)))
         else:
@@ -277,7 +772,7 @@ def calculate_scores(fake_probs, media_type, frame_count=1, faces_detected=0, au
         # Calculate confidence (how certain the model is)
         # Use the average of how far predictions are from 0.5 (uncertain)
         if len(fake_probs) > 0:
-            confidence = float(np.mean([abs(p - 0.5) * 2 for p in fake_probs]) * 100)
+            confidence = mean_abs_dev * 200.0
         elif audio_fake_prob is not None:
             # Audio-only: use audio confidence
             confidence = float(abs(audio_fake_prob - 0.5) * 2 * 100)
@@ -372,6 +867,20 @@ def health_check():
     }), 200 if _model_loaded else 503
 
 
+@app.before_request
+def _announce_inference():
+    """Let the batch scheduler hold batches for inference requests that are still preprocessing"""
+    if request.endpoint == 'inference':
+        _batch_scheduler.begin_request()
+
+
+@app.teardown_request
+def _finish_inference(exc):
+    """Counterpart of _announce_inference (runs even if the request failed)"""
+    if request.endpoint == 'inference':
+        _batch_scheduler.end_request()
+
+
 @app.route('/api/v1/inference', methods=['POST'])
 def inference():
     """
@@ -399,16 +908,31 @@ def inference():
         model_version = data.get('modelVersion', 'v4')
         extracted_frames = data.get('extractedFrames', [])
         extracted_audio = data.get('extractedAudio', None)
-
-        logger.info(f'[ML_SERVICE] Inference request: hash={hash_value[:16] if hash_value else "none"}..., type={media_type}, model={model_version}')
-
-        # Get pipeline
-        pipeline = get_pipeline()
+        video_path = data.get('videoPath', None)
+        frames_array_path = data.get('extractedFramesShmPath', None)
+
+        hash_preview = hash_value[:16] if hash_value else 'none'
+        logger.info(f'[ML_SERVICE] Inference request: hash={hash_preview}..., type={media_type}, model={model_version}')
+
+        # Identical media was already analyzed - skip preprocessing and inference
+        cache_key = (hash_value, model_version, media_type) if hash_value else None
+        if cache_key is not None:
+            cached = get_cached_result(cache_key)
+            if cached is not None:
+                logger.info(f'[ML_SERVICE] Returning cached result for hash={hash_preview}...')
+                return jsonify({
+                    **cached,
+                    'cached': True,
+                    'inference_time': int((time.time() - start_time) * 1000)
+                }), 200
 
         # Track face detection
         faces_detected = 0
         total_frames = 0
 
+        # Responses that are missing part of the analysis are not cached (see VIDEO)
+        cacheable = True
+
         # Process based on media type
         if media_type == 'IMAGE':
             if not extracted_frames:
@@ -416,11 +940,8 @@ def inference():
 
             # Process first frame as image
             image_path = extracted_frames[0] if isinstance(extracted_frames, list) else extracted_frames
-            
-            # Validate path exists
-            if not os.path.exists(image_path):
-                raise ValueError(f'Image file not found: {image_path}')
-            
+
+            # A missing file raises FileNotFoundError from open - no separate stat
             image, face_found = preprocess_image(image_path, return_face_info=True)
             total_frames = 1
             faces_detected = 1 if face_found else 0
@@ -428,68 +949,128 @@ def inference():
             if not face_found:
                 logger.warning(f'[ML_SERVICE] No face detected in image - results may be less accurate')
 
-            # Run inference
-            fake_probs, results = run_inference(pipeline, image)
+            # Run inference (batched with concurrent requests)
+            fake_probs = _batch_scheduler.submit([image])
             scores = calculate_scores(fake_probs, media_type, frame_count=1, faces_detected=faces_detected)
 
         elif media_type == 'VIDEO':
-            if not extracted_frames:
-                raise ValueError('No frame paths provided for VIDEO')
-
-            # Validate frame paths exist
-            valid_paths = []
-            for frame_path in extracted_frames:
-                if os.path.exists(frame_path):
-                    valid_paths.append(frame_path)
+            if not extracted_frames and not video_path and not frames_array_path:
+                raise ValueError('No frame paths or video path provided for VIDEO')
+
+            # Start the audio track analysis now so it overlaps frame processing
+            audio_future = None
+            if extracted_audio:
+                audio_future = _audio_executor.submit(analyze_audio_track, extracted_audio)
+
+            # Process frames (sampled evenly across the video, limited for performance)
+            max_frames = MAX_FRAMES
+
+            use_gpu_frames = is_gpu_decode_available() and get_device() >= 0 and get_model_backend() == 'torch'
+            if frames_array_path:
+                frame_source = 'array'
+            elif video_path:
+                frame_source = 'video'
+            else:
+                frame_source = 'frames-gpu' if use_gpu_frames else 'frames'
+            signature = _frame_cache_signature(frame_source)
+
+            cached_frames = None
+            if hash_value and is_frame_cache_enabled():
+                cached_frames = load_frames(hash_value, model_version, signature)
+
+            if cached_frames is not None:
+                # Same video seen before - reuse its preprocessed frames from the disk cache
+                pixel_values, face_flags = cached_frames
+                fake_probs = _batch_scheduler.submit(pixel_values)
+            elif frames_array_path:
+                # Raw frames handed over in one (N, H, W, 3) array - no image decoding
+                images, _, face_flags = preprocess_frame_array(
+                    frames_array_path,
+                    max_frames=max_frames,
+                    executor=_preprocess_executor,
+                    return_face_info=True
+                )
+
+                if not images:
+                    raise ValueError('No valid frames in frame array')
+
+                fake_probs = _infer_frames(images, face_flags, hash_value, model_version, signature)
+            elif video_path:
+                # Decode sampled frames straight from the video - no frame files on disk
+                images, _, face_flags = preprocess_video(
+                    video_path,
+                    max_frames=max_frames,
+                    executor=_preprocess_executor,
+                    return_face_info=True
+                )
+
+                if not images:
+                    raise ValueError('No valid frames decoded from video')
+
+                fake_probs = _infer_frames(images, face_flags, hash_value, model_version, signature)
+            else:
+                # Missing frame files are skipped (and counted) by the preprocessing itself
+                # instead of being stat'ed up front
+
+                # Fast path: decode JPEG frames with nvJPEG and preprocess on the GPU
+                gpu_frames = None
+                if use_gpu_frames:
+                    pipeline = get_pipeline()
+                    gpu_frames = preprocess_frames_gpu(
+                        sample_frame_paths(extracted_frames, max_frames),
+                        pipeline.image_processor,
+                        pipeline.model.device,
+                        dtype=pipeline.model.dtype
+                    )
+
+                if gpu_frames is not None:
+                    pixel_values, _, face_flags = gpu_frames
+                    if hash_value and is_frame_cache_enabled():
+                        save_frames(hash_value, model_version, pixel_values, face_flags, signature)
+                    fake_probs = _batch_scheduler.submit(pixel_values)
+                elif not (hash_value and is_frame_cache_enabled()):
+                    # Pipeline CPU preprocessing with inference: each chunk is scored while
+                    # the pool is still decoding and cropping the frames after it
+                    chunk_probs = []
+                    face_flags = []
+                    for images, _, chunk_flags in iter_preprocessed_frames(
+                        extracted_frames,
+                        max_frames=max_frames,
+                        executor=_preprocess_executor,
+                        chunk_size=INFERENCE_BATCH_SIZE
+                    ):
+                        chunk_probs.append(_batch_scheduler.submit(images))
+                        face_flags.extend(chunk_flags)
+
+                    if not face_flags:
+                        raise ValueError('No valid frames processed')
+
+                    fake_probs = np.concatenate(chunk_probs)
                 else:
-                    logger.warning(f'[ML_SERVICE] Frame file not found: {frame_path}')
-
-            if not valid_paths:
-                raise ValueError('No valid frame files found')
-
-            # Process frames (limit to max 30 frames for performance)
-            max_frames = 30
-            images, valid_frames = preprocess_frames(valid_paths, max_frames=max_frames)
-
-            if not images or len(valid_frames) == 0:
-                raise ValueError('No valid frames processed')
-
-            total_frames = len(valid_frames)
-
-            # Check face detection for each frame
-            faces_detected = 0
-            processed_images = []
-            for img in images:
-                # Note: images are already preprocessed with face detection
-                # We assume preprocessing applied face detection
-                # Check if it's a face crop by comparing aspect ratio and size
-                w, h = img.size
-                aspect_ratio = w / h if h > 0 else 1
-                # Face crops are typically square-ish (aspect ratio near 1)
-                if 0.7 <= aspect_ratio <= 1.3:
-                    faces_detected += 1
-                processed_images.append(img)
-
-            # Run video/image inference on all frames
-            fake_probs, results = run_inference(pipeline, processed_images)
-
-            # Process audio if available
+                    images, _, face_flags = preprocess_frames(
+                        extracted_frames,
+                        max_frames=max_frames,
+                        executor=_preprocess_executor,
+                        return_face_info=True
+                    )
+
+                    if not images:
+                        raise ValueError('No valid frames processed')
+
+                    fake_probs = _infer_frames(images, face_flags, hash_value, model_version, signature)
+
+            total_frames = len(face_flags)
+            faces_detected = sum(face_flags)
+
+            # Collect the audio result (analysed concurrently with the frames)
             audio_fake_prob = None
-            if extracted_audio and os.path.exists(extracted_audio):
-                logger.info(f'[ML_SERVICE] Processing audio track: {extracted_audio}')
-
-                if is_audio_model_loaded() and is_audio_processing_available():
-                    audio_data = preprocess_audio(extracted_audio)
-                    if audio_data['valid']:
-                        audio_fake_prob, audio_raw = run_audio_inference(audio_data)
-                        if audio_fake_prob is not None:
-                            logger.info(f'[ML_SERVICE] Audio analysis complete: fake_prob={audio_fake_prob:.4f}')
-                        else:
-                            logger.warning('[ML_SERVICE] Audio inference returned None')
-                    else:
-                        logger.warning(f'[ML_SERVICE] Audio preprocessing failed: {audio_data.get("error")}')
-                else:
-                    logger.info('[ML_SERVICE] Audio model not available, skipping audio analysis')
+            if audio_future is not None:
+                audio_fake_prob = audio_future.result()
+                if audio_fake_prob is None and os.path.exists(extracted_audio):
+                    # The track exists but was not scored (audio model still loading in
+                    # the background, or inference failed) - a video-only score must not
+                    # be served for this hash once the audio model is available
+                    cacheable = False
             else:
                 logger.info('[ML_SERVICE] No audio track provided for video')
 
@@ -497,7 +1078,7 @@ def inference():
             scores = calculate_scores(
                 fake_probs,
                 media_type,
-                frame_count=len(valid_frames),
+                frame_count=total_frames,
                 faces_detected=faces_detected,
                 audio_fake_prob=audio_fake_prob
             )
@@ -563,6 +1144,10 @@ def inference():
 
         logger.info(f'[ML_SERVICE] Inference complete: risk_score={response["risk_score"]}, confidence={response["confidence"]}, faces={faces_detected}/{total_frames}, time={inference_time}ms')
 
+        if cache_key is not None and cacheable:
+            # Timing belongs to this request - cache hits report their own lookup time
+            cache_result(cache_key, {key: value for key, value in response.items() if key != 'inference_time'})
+
         return jsonify(response), 200
 
     except Exception as e:
@@ -602,7 +1187,8 @@ if __name__ == '__main__':
     logger.info(f'[ML_SERVICE] Using deepfake-detector-model-v1 (94.44% accuracy)')
     logger.info(f'[ML_SERVICE] Using wav2vec2-large-xlsr-deepfake-audio-classification (92.86% accuracy)')
 
-    app.run(host='0.0.0.0', port=port, debug=False)
+    # Development server - production runs under gunicorn (gunicorn.conf.py)
+    app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
 else:
     # Also load when imported as module (e.g., for testing)
     load_model_on_startup()
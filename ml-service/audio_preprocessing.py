@@ -4,24 +4,33 @@ Audio Preprocessing Module for Deepfake Detection
 Handles audio loading, validation, and preprocessing for the wav2vec2-based
 audio deepfake detection model.
 
-Uses librosa for resampling from 44.1kHz (FFmpeg output) to 16kHz (model requirement)
+Decodes with soundfile and resamples with soxr from 44.1kHz (FFmpeg output) to 16kHz
+(model requirement); librosa is the fallback for formats libsndfile cannot read
 Target model: Gustking/wav2vec2-large-xlsr-deepfake-audio-classification
 """
 
 import os
 import logging
+import importlib.util
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
-# Try to import librosa - graceful fallback if not available
+# Try to import soundfile + soxr - direct decode/resample path, librosa.load is used if not available
 try:
-    import librosa
-    LIBROSA_AVAILABLE = True
-    logger.info('[AUDIO_PREPROCESSING] librosa loaded successfully')
+    import soundfile as sf
+    import soxr
+    SOUNDFILE_AVAILABLE = True
 except ImportError:
-    LIBROSA_AVAILABLE = False
-    logger.warning('[AUDIO_PREPROCESSING] librosa not available - audio processing disabled')
+    SOUNDFILE_AVAILABLE = False
+
+# librosa is only the fallback decoder and pulls in numba/scipy/audioread, so it
+# is located here but imported on first use (see _get_librosa)
+LIBROSA_AVAILABLE = importlib.util.find_spec('librosa') is not None
+_librosa = None
+
+if not (SOUNDFILE_AVAILABLE or LIBROSA_AVAILABLE):
+    logger.warning('[AUDIO_PREPROCESSING] soundfile/soxr and librosa not available - audio processing disabled')
 
 # Constants
 TARGET_SAMPLE_RATE = 16000  # wav2vec2 models require 16kHz
@@ -30,24 +39,60 @@ MAX_AUDIO_DURATION = 30.0   # Maximum 30 seconds for memory efficiency
 SILENCE_THRESHOLD = 0.001   # RMS threshold for silence detection
 
 
+def _get_librosa():
+    """Import librosa on first use"""
+    global _librosa
+    if _librosa is None:
+        import librosa
+        _librosa = librosa
+        logger.info('[AUDIO_PREPROCESSING] librosa loaded successfully')
+    return _librosa
+
+
 def is_audio_processing_available():
     """Check if audio processing is available"""
-    return LIBROSA_AVAILABLE
+    return LIBROSA_AVAILABLE or SOUNDFILE_AVAILABLE
+
+
+def _load_soundfile(audio_path, target_sr, max_duration):
+    """
+    Decode with libsndfile and resample with soxr (no audioread / librosa dispatch)
+
+    Only the first max_duration seconds are decoded.
+
+    Returns:
+        float32 mono audio array at target_sr
+    """
+    with sf.SoundFile(audio_path) as f:
+        sr = f.samplerate
+        frames = int(max_duration * sr) if max_duration else -1
+        if 0 <= frames < f.frames:
+            logger.info(f'[AUDIO_PREPROCESSING] Decoding first {max_duration}s of {f.frames / sr:.2f}s audio')
+        audio = f.read(frames=frames, dtype='float32', always_2d=True)
+
+    # Downmix to mono
+    audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+
+    if sr != target_sr:
+        audio = soxr.resample(audio, sr, target_sr, quality='HQ')
 
+    return np.ascontiguousarray(audio, dtype=np.float32)
 
-def load_audio(audio_path, target_sr=TARGET_SAMPLE_RATE):
+
+def load_audio(audio_path, target_sr=TARGET_SAMPLE_RATE, max_duration=None):
     """
     Load and resample audio file to target sample rate
 
     Args:
         audio_path: Path to audio file (WAV, MP3, FLAC supported)
         target_sr: Target sample rate (default 16kHz for wav2vec2)
+        max_duration: Only load this many seconds from the start (None = whole file)
 
     Returns:
         tuple: (audio_array, sample_rate) or (None, None) on failure
     """
-    if not LIBROSA_AVAILABLE:
-        logger.error('[AUDIO_PREPROCESSING] librosa not available')
+    if not is_audio_processing_available():
+        logger.error('[AUDIO_PREPROCESSING] Neither soundfile nor librosa available')
         return None, None
 
     try:
@@ -66,10 +111,24 @@ def load_audio(audio_path, target_sr=TARGET_SAMPLE_RATE):
 
         logger.info(f'[AUDIO_PREPROCESSING] Loading audio: {audio_path} ({file_size} bytes)')
 
-        # Load audio with librosa
-        # sr=target_sr automatically resamples from source (e.g., 44.1kHz) to target (16kHz)
-        # mono=True converts stereo to mono
-        audio, sr = librosa.load(audio_path, sr=target_sr, mono=True)
+        audio = None
+        sr = target_sr
+        if SOUNDFILE_AVAILABLE:
+            try:
+                audio = _load_soundfile(audio_path, target_sr, max_duration)
+            except Exception as e:
+                if not LIBROSA_AVAILABLE:
+                    raise
+                logger.info(f'[AUDIO_PREPROCESSING] soundfile could not decode audio, using librosa: {str(e)}')
+
+        if audio is None:
+            # Load audio with librosa
+            # sr=target_sr automatically resamples from source (e.g., 44.1kHz) to target (16kHz)
+            # with soxr's SIMD polyphase resampler (res_type pinned so it never falls back
+            # to the much slower scipy/resampy filters)
+            # mono=True converts stereo to mono
+            audio, sr = _get_librosa().load(audio_path, sr=target_sr, mono=True, res_type='soxr_hq', duration=max_duration)
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
 
         duration = len(audio) / sr
         logger.info(f'[AUDIO_PREPROCESSING] Loaded audio: {duration:.2f}s at {sr}Hz, {len(audio)} samples')
@@ -112,31 +171,31 @@ def validate_audio(audio, sample_rate, min_duration=MIN_AUDIO_DURATION, max_dura
         # This is a warning, not an error - we'll truncate
         logger.warning(f'[AUDIO_PREPROCESSING] Audio will be truncated: {duration:.2f}s > {max_duration}s')
 
-    # Check for silence (very low RMS energy)
-    rms = np.sqrt(np.mean(audio**2))
+    # Check for NaN or Inf values (one pass instead of separate isnan/isinf sweeps)
+    if not np.isfinite(audio).all():
+        return False, 'Audio contains NaN or Inf values'
+
+    # Check for silence (very low RMS energy) - sum of squares as a BLAS dot, no audio**2 temporary
+    rms = (float(np.dot(audio, audio)) / len(audio)) ** 0.5
     if rms < SILENCE_THRESHOLD:
         return False, f'Audio appears to be silent (RMS: {rms:.6f})'
 
-    # Check for NaN or Inf values
-    if np.isnan(audio).any() or np.isinf(audio).any():
-        return False, 'Audio contains NaN or Inf values'
-
     return True, None
 
 
 def normalize_audio(audio):
     """
-    Normalize audio to [-1, 1] range
+    Normalize audio to [-1, 1] range (in place)
 
     Args:
-        audio: numpy array of audio samples
+        audio: Writable float numpy array of audio samples (modified in place)
 
     Returns:
-        Normalized audio array
+        Normalized audio array (the same array)
     """
-    max_val = np.abs(audio).max()
+    max_val = float(np.abs(audio).max())
     if max_val > 0:
-        return audio / max_val
+        np.multiply(audio, 1.0 / max_val, out=audio)
     return audio
 
 
@@ -164,14 +223,14 @@ def preprocess_audio(audio_path, max_duration=MAX_AUDIO_DURATION):
         'error': None
     }
 
-    # Check if librosa is available
-    if not LIBROSA_AVAILABLE:
-        result['error'] = 'Audio processing not available (librosa not installed)'
+    # Check if an audio decoder is available
+    if not is_audio_processing_available():
+        result['error'] = 'Audio processing not available (soundfile/librosa not installed)'
         logger.warning(f'[AUDIO_PREPROCESSING] {result["error"]}')
         return result
 
-    # Load audio (automatically resamples to 16kHz)
-    audio, sr = load_audio(audio_path, TARGET_SAMPLE_RATE)
+    # Load audio (automatically resamples to 16kHz, decodes at most max_duration)
+    audio, sr = load_audio(audio_path, TARGET_SAMPLE_RATE, max_duration=max_duration)
     if audio is None:
         result['error'] = 'Failed to load audio file'
         return result
@@ -218,12 +277,19 @@ def get_audio_stats(audio, sample_rate):
     if audio is None or len(audio) == 0:
         return {}
 
+    # Sum and sum of squares give rms, mean and std without separate sweeps
+    n = len(audio)
+    s1 = float(audio.sum(dtype=np.float64))
+    s2 = float(np.dot(audio, audio))
+    mean = s1 / n
+    var = s2 / n - mean * mean
+
     return {
-        'duration': len(audio) / sample_rate,
+        'duration': n / sample_rate,
         'sample_rate': sample_rate,
-        'samples': len(audio),
-        'rms': float(np.sqrt(np.mean(audio**2))),
+        'samples': n,
+        'rms': (s2 / n) ** 0.5,
         'peak': float(np.abs(audio).max()),
-        'mean': float(np.mean(audio)),
-        'std': float(np.std(audio))
+        'mean': mean,
+        'std': var ** 0.5 if var > 0 else 0.0
     }
@@ -0,0 +1,154 @@
+"""
+Batching Module
+Coalesces images from concurrent inference requests into shared forward passes
+
+Each request thread submits its preprocessed images and blocks until its slice
+of the results is ready. A single background worker runs one inference call for
+everything queued. It only holds a batch back while other announced requests
+(begin_request) are still preparing their images, and then for at most
+max_latency_ms after the oldest queued request arrived or until max_batch_size
+images are queued - a lone request is run right away.
+"""
+
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingRequest:
+    """Images submitted by one request and the slot its results are written to"""
+
+    def __init__(self, images):
+        self.images = images
+        self.results = None
+        self.error = None
+        self.arrival = time.monotonic()
+        self.done = threading.Event()
+
+
+class BatchScheduler:
+    """
+    Micro-batching scheduler shared by all request threads
+
+    Every forward pass runs on the scheduler's single worker thread, which also
+    keeps per-thread state of the model (e.g. recorded CUDA graphs) in one place.
+
+    Args:
+        infer_fn: Callable taking a list of images and returning one result per image
+        max_batch_size: Number of queued images that triggers an immediate batch
+        max_latency_ms: Maximum time the oldest request waits for the batch to fill
+    """
+
+    def __init__(self, infer_fn, max_batch_size=16, max_latency_ms=50):
+        self._infer_fn = infer_fn
+        self._max_batch_size = max_batch_size
+        self._max_latency = max_latency_ms / 1000.0
+        self._queue = []
+        self._queued_images = 0
+        # Announced requests that have not submitted their images yet
+        self._preparing = 0
+        self._local = threading.local()
+        self._condition = threading.Condition()
+        self._worker = None
+
+    def begin_request(self):
+        """Announce a request on this thread that is about to submit images"""
+        with self._condition:
+            if not getattr(self._local, 'announced', False):
+                self._local.announced = True
+                self._preparing += 1
+
+    def end_request(self):
+        """Mark the request announced on this thread as finished"""
+        with self._condition:
+            if getattr(self._local, 'announced', False):
+                self._local.announced = False
+                self._preparing -= 1
+                self._condition.notify()
+
+    def submit(self, images):
+        """
+        Queue images for inference and wait for their results
+
+        Args:
+            images: List of preprocessed images, or a pixel-value tensor (one row per image)
+
+        Returns:
+            List of results (one per image, in order)
+        """
+        if len(images) == 0:
+            return []
+
+        announced = getattr(self._local, 'announced', False)
+        pending = _PendingRequest(images)
+        with self._condition:
+            self._ensure_worker()
+            self._queue.append(pending)
+            self._queued_images += len(images)
+            if announced:
+                # Not preparing while its images are queued / running
+                self._preparing -= 1
+            self._condition.notify()
+
+        try:
+            pending.done.wait()
+        finally:
+            if announced:
+                # The request may submit again (video frames are scored in chunks)
+                with self._condition:
+                    self._preparing += 1
+
+        if pending.error is not None:
+            raise pending.error
+        return pending.results
+
+    def _ensure_worker(self):
+        """Start the background worker on first use (caller holds the condition)"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name='batch-scheduler', daemon=True)
+            self._worker.start()
+
+    def _next_batch(self):
+        """Block until a batch is ready and take it off the queue"""
+        with self._condition:
+            while not self._queue:
+                self._condition.wait()
+
+            # Only wait for requests that are still preparing images
+            deadline = self._queue[0].arrival + self._max_latency
+            while self._queued_images < self._max_batch_size and self._preparing > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = self._queue
+            self._queue = []
+            self._queued_images = 0
+            return batch
+
+    def _run(self):
+        """Worker loop: run one inference call per gathered batch and fan results out"""
+        while True:
+            batch = self._next_batch()
+            images = [image for pending in batch for image in pending.images]
+
+            try:
+                results = self._infer_fn(images)
+                if len(batch) > 1:
+                    logger.info(f'[BATCHING] Coalesced {len(batch)} requests into one batch of {len(images)} images')
+
+                offset = 0
+                for pending in batch:
+                    count = len(pending.images)
+                    pending.results = results[offset:offset + count]
+                    offset += count
+            except Exception as e:
+                logger.error(f'[BATCHING] Batch inference failed: {str(e)}', exc_info=True)
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
@@ -14,6 +14,9 @@ import numpy as np
 from PIL import Image
 import logging
 import os
+import shutil
+import tempfile
+import threading
 import urllib.request
 
 logger = logging.getLogger(__name__)
@@ -22,6 +25,22 @@ logger = logging.getLogger(__name__)
 _face_detector = None
 _detector_initialized = False
 _detection_method = "none"
+_dnn_paths = None
+# The missing-detector warning is logged once, not for every image
+_unavailable_warned = False
+_init_lock = threading.Lock()
+# Per-thread detector instances (see get_face_detector)
+_thread_local = threading.local()
+
+# FACE_DETECT_CONCURRENCY: maximum detections running at once (see _run_detector)
+FACE_DETECT_CONCURRENCY = int(os.environ.get('FACE_DETECT_CONCURRENCY', min(os.cpu_count() or 1, 4)))
+_detect_semaphore = threading.BoundedSemaphore(max(1, FACE_DETECT_CONCURRENCY))
+
+HAAR_CASCADE_FILE = "haarcascade_frontalface_default.xml"
+# Shortest image side the Haar cascade scans at (larger images are downscaled first)
+HAAR_MAX_SIDE = 640
+# Blank image size used to warm up a detector
+DETECTOR_WARMUP_SIZE = 64
 
 # OpenCV DNN model URLs (SSD with ResNet-10 backbone)
 DNN_MODEL_URL = "https://raw.githubusercontent.com/opencv/opencv_3rdparty/dnn_samples_face_detector_20170830/res10_300x300_ssd_iter_140000.caffemodel"
@@ -34,7 +53,17 @@ def _download_file(url, filepath):
         return True
     try:
         logger.info(f'[FACE_DETECTION] Downloading: {url}')
-        urllib.request.urlretrieve(url, filepath)
+        # Stream in 1 MiB blocks (urlretrieve reads 8 KiB at a time) to a temporary
+        # file, renamed into place so an interrupted download is never mistaken
+        # for a complete model on the next start
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), suffix='.tmp')
+        try:
+            with urllib.request.urlopen(url) as response, os.fdopen(fd, 'wb') as f:
+                shutil.copyfileobj(response, f, length=1024 * 1024)
+            os.replace(tmp_path, filepath)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
         logger.info(f'[FACE_DETECTION] Downloaded to: {filepath}')
         return True
     except Exception as e:
@@ -43,11 +72,39 @@ def _download_file(url, filepath):
 
 
 def get_face_detector():
-    """Get or initialize the face detector (singleton pattern)"""
-    global _face_detector, _detector_initialized, _detection_method
+    """
+    Get the face detector for the calling thread
+
+    The detection method is chosen (and the DNN model downloaded) once per
+    process. OpenCV nets keep per-call state (setInput / forward), so each
+    preprocessing thread gets its own detector instance instead of sharing one.
+    """
+    if not _detector_initialized:
+        with _init_lock:
+            if not _detector_initialized:
+                _initialize_detector()
+
+    if _face_detector is None:
+        return None
+
+    detector = getattr(_thread_local, 'detector', None)
+    if detector is None:
+        detector = _create_detector()
+        _thread_local.detector = detector
+    return detector
+
 
-    if _detector_initialized:
-        return _face_detector
+def _create_detector():
+    """Build a new detector instance for the method chosen at initialization"""
+    if _detection_method.startswith("OpenCV DNN"):
+        config_path, model_path = _dnn_paths
+        return cv2.dnn.readNetFromCaffe(config_path, model_path)
+    return cv2.CascadeClassifier(cv2.data.haarcascades + HAAR_CASCADE_FILE)
+
+
+def _initialize_detector():
+    """Pick the detection method and load the first detector (caller holds _init_lock)"""
+    global _face_detector, _detector_initialized, _detection_method, _dnn_paths
 
     try:
         # Get the directory where this script is located
@@ -65,12 +122,13 @@ def get_face_detector():
         if model_downloaded and config_downloaded:
             # Use OpenCV DNN face detector (much better than Haar Cascade)
             _face_detector = cv2.dnn.readNetFromCaffe(config_path, model_path)
+            _dnn_paths = (config_path, model_path)
             _detection_method = "OpenCV DNN (SSD ResNet-10)"
             logger.info(f'[FACE_DETECTION] {_detection_method} initialized')
         else:
             # Fallback to Haar Cascade
             logger.warning('[FACE_DETECTION] DNN model not available, using Haar Cascade fallback')
-            modelFile = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+            modelFile = cv2.data.haarcascades + HAAR_CASCADE_FILE
             _face_detector = cv2.CascadeClassifier(modelFile)
 
             if _face_detector.empty():
@@ -81,15 +139,14 @@ def get_face_detector():
                 _detection_method = "OpenCV Haar Cascade (fallback)"
                 logger.info(f'[FACE_DETECTION] {_detection_method} initialized')
 
+        _thread_local.detector = _face_detector
         _detector_initialized = True
-        return _face_detector
 
     except Exception as e:
         logger.error(f'[FACE_DETECTION] Error initializing face detector: {str(e)}')
         _detector_initialized = True
         _face_detector = None
         _detection_method = "none"
-        return None
 
 
 def _detect_face_dnn(image_rgb, net, confidence_threshold=0.15):
@@ -139,7 +196,17 @@ def _detect_face_dnn(image_rgb, net, confidence_threshold=0.15):
 
 
 def _detect_face_haar(gray, detector):
-    """Detect faces using Haar Cascade (fallback)"""
+    """Detect faces using Haar Cascade (fallback)
+
+    The cascade's cost grows with the pixel count, so large images are scanned
+    at HAAR_MAX_SIDE (shortest side) and the box is scaled back to full resolution.
+    """
+    scale = 1.0
+    img_h, img_w = gray.shape[:2]
+    if min(img_h, img_w) > HAAR_MAX_SIDE:
+        scale = HAAR_MAX_SIDE / min(img_h, img_w)
+        gray = cv2.resize(gray, (round(img_w * scale), round(img_h * scale)), interpolation=cv2.INTER_AREA)
+
     faces = detector.detectMultiScale(
         gray,
         scaleFactor=1.1,
@@ -152,9 +219,101 @@ def _detect_face_haar(gray, detector):
 
     # Get the largest face (by area)
     largest_face = max(faces, key=lambda f: f[2] * f[3])
+    if scale != 1.0:
+        return tuple(int(v / scale) for v in largest_face)
     return tuple(largest_face)
 
 
+def _run_detector(image_rgb, detector):
+    """
+    Detect the largest face with the active method
+
+    OpenCV parallelizes each detection internally, so at most
+    FACE_DETECT_CONCURRENCY detections run at once; the remaining preprocessing
+    threads keep decoding frames instead of oversubscribing the CPU.
+    """
+    with _detect_semaphore:
+        if _detection_method.startswith("OpenCV DNN"):
+            return _detect_face_dnn(image_rgb, detector)
+
+        gray = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2GRAY)
+        return _detect_face_haar(gray, detector)
+
+
+def detect_face_bbox(image_rgb):
+    """
+    Detect the largest face in an RGB numpy image
+
+    Args:
+        image_rgb: numpy array (H, W, 3) in RGB format
+
+    Returns:
+        (x, y, w, h) of the largest face, or None if no face / no detector
+    """
+    detector = get_face_detector()
+    if detector is None:
+        return None
+
+    return _run_detector(image_rgb, detector)
+
+
+def compute_crop_box(face_bbox, img_w, img_h, padding_percent=30):
+    """
+    Compute a padded square crop around a face, shifted to stay inside the image
+
+    Args:
+        face_bbox: (x, y, w, h) of the detected face
+        img_w: Image width
+        img_h: Image height
+        padding_percent: Percentage of padding to add around face (default: 30%)
+
+    Returns:
+        (x1, y1, x2, y2) crop coordinates
+    """
+    x, y, w, h = face_bbox
+
+    # Make the crop square and add padding
+    center_x = x + w / 2
+    center_y = y + h / 2
+    max_dim = max(w, h)
+
+    # Add padding (default 30%)
+    # For efficientnet_b0_ffpp_c23, a looser crop is often better
+    size = int(max_dim * (1 + padding_percent / 100))
+
+    # Calculate square coordinates centered on face
+    half_size = size // 2
+    x1 = int(max(0, center_x - half_size))
+    y1 = int(max(0, center_y - half_size))
+    x2 = int(min(img_w, center_x + half_size))
+    y2 = int(min(img_h, center_y + half_size))
+
+    # Adjust if we hit boundaries to keep square aspect ratio
+    crop_w = x2 - x1
+    crop_h = y2 - y1
+
+    # Try to shift the box into the image if clipped
+    if crop_w < size:
+        if x1 == 0:
+            x2 = min(img_w, size)
+        elif x2 == img_w:
+            x1 = max(0, img_w - size)
+
+    if crop_h < size:
+        if y1 == 0:
+            y2 = min(img_h, size)
+        elif y2 == img_h:
+            y1 = max(0, img_h - size)
+
+    # Final update
+    x2 = min(img_w, x1 + size)
+    y2 = min(img_h, y1 + size)
+    x1 = max(0, x2 - size)
+    y1 = max(0, y2 - size)
+
+    return x1, y1, x2, y2
+
+
 def detect_and_crop_face(image, padding_percent=30, return_bbox=False):
     """
     Detect face in image and return cropped face
@@ -170,15 +329,18 @@ def detect_and_crop_face(image, padding_percent=30, return_bbox=False):
 
     Note:
         The model expects CROPPED FACE images. If no face is detected, the original
-        image is returned, which may lead to incorrect predictions. Check logs for
-        "No face detected" warnings.
+        image is returned, which may lead to incorrect predictions. Batch callers
+        log one "No face detected in N of M images" warning per batch; single
+        misses are only logged at debug level.
     """
+    global _unavailable_warned
+
     try:
-        # Convert PIL Image to numpy array if needed
+        # Convert PIL Image to numpy array if needed (arrays are only read, never copied)
         if isinstance(image, Image.Image):
             image_np = np.array(image)
         else:
-            image_np = image.copy()
+            image_np = np.asarray(image)
 
         # Ensure RGB format
         if len(image_np.shape) == 2:
@@ -195,69 +357,28 @@ def detect_and_crop_face(image, padding_percent=30, return_bbox=False):
         detector = get_face_detector()
 
         if detector is None:
-            logger.warning('[FACE_DETECTION] Detector not available, using full image (may cause incorrect predictions)')
+            if not _unavailable_warned:
+                _unavailable_warned = True
+                logger.warning('[FACE_DETECTION] Detector not available, using full images (may cause incorrect predictions)')
             if return_bbox:
                 return Image.fromarray(image_rgb), None
             return Image.fromarray(image_rgb)
 
         # Detect face using appropriate method
-        if _detection_method.startswith("OpenCV DNN"):
-            face_bbox = _detect_face_dnn(image_rgb, detector)
-        else:
-            gray = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2GRAY)
-            face_bbox = _detect_face_haar(gray, detector)
+        face_bbox = _run_detector(image_rgb, detector)
 
         if face_bbox is None:
-            logger.warning(f'[FACE_DETECTION] No face detected in image of size {image_rgb.shape}, using full image (may cause incorrect predictions)')
+            # Per image, so debug only - batch callers log one summary
+            logger.debug('[FACE_DETECTION] No face detected in image of size %s, using full image', image_rgb.shape)
             if return_bbox:
                 return Image.fromarray(image_rgb), None
             return Image.fromarray(image_rgb)
         else:
-            logger.info(f'[FACE_DETECTION] Face found at {face_bbox} in image of size {image_rgb.shape}')
+            logger.debug('[FACE_DETECTION] Face found at %s in image of size %s', face_bbox, image_rgb.shape)
 
         x, y, w, h = face_bbox
-
-        # Make the crop square and add padding
-        center_x = x + w / 2
-        center_y = y + h / 2
-        max_dim = max(w, h)
-
-        # Calculate image dimensions
         img_h, img_w = image_rgb.shape[:2]
-
-        # Add padding (default 30%)
-        # For efficientnet_b0_ffpp_c23, a looser crop is often better
-        size = int(max_dim * (1 + padding_percent / 100))
-
-        # Calculate square coordinates centered on face
-        half_size = size // 2
-        x1 = int(max(0, center_x - half_size))
-        y1 = int(max(0, center_y - half_size))
-        x2 = int(min(img_w, center_x + half_size))
-        y2 = int(min(img_h, center_y + half_size))
-
-        # Adjust if we hit boundaries to keep square aspect ratio
-        crop_w = x2 - x1
-        crop_h = y2 - y1
-
-        # Try to shift the box into the image if clipped
-        if crop_w < size:
-            if x1 == 0:
-                x2 = min(img_w, size)
-            elif x2 == img_w:
-                x1 = max(0, img_w - size)
-
-        if crop_h < size:
-            if y1 == 0:
-                y2 = min(img_h, size)
-            elif y2 == img_h:
-                y1 = max(0, img_h - size)
-
-        # Final update
-        x2 = min(img_w, x1 + size)
-        y2 = min(img_h, y1 + size)
-        x1 = max(0, x2 - size)
-        y1 = max(0, y2 - size)
+        x1, y1, x2, y2 = compute_crop_box(face_bbox, img_w, img_h, padding_percent)
 
         # Crop face
         face_crop = image_rgb[y1:y2, x1:x2]
@@ -265,7 +386,8 @@ def detect_and_crop_face(image, padding_percent=30, return_bbox=False):
         # Convert back to PIL Image
         face_image = Image.fromarray(face_crop)
 
-        logger.debug(f'[FACE_DETECTION] Face detected and cropped: bbox=({x1},{y1},{x2-x1},{y2-y1}), original_face=({x},{y},{w},{h})')
+        logger.debug('[FACE_DETECTION] Face detected and cropped: bbox=(%d,%d,%d,%d), original_face=(%d,%d,%d,%d)',
+                     x1, y1, x2 - x1, y2 - y1, x, y, w, h)
 
         if return_bbox:
             return face_image, (x1, y1, x2-x1, y2-y1)
@@ -308,38 +430,40 @@ def detect_faces_in_frame(frame, min_confidence=0.5):
         else:
             frame_rgb = frame
 
-        if _detection_method.startswith("OpenCV DNN"):
-            h, w = frame_rgb.shape[:2]
-            blob = cv2.dnn.blobFromImage(
-                cv2.resize(frame_rgb, (300, 300)),
-                1.0,
-                (300, 300),
-                (104.0, 177.0, 123.0)
-            )
-            detector.setInput(blob)
-            detections = detector.forward()
-
-            faces = []
-            for i in range(detections.shape[2]):
-                confidence = detections[0, 0, i, 2]
-                if confidence > min_confidence:
-                    box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-                    x1, y1, x2, y2 = box.astype("int")
-                    x1, y1 = max(0, x1), max(0, y1)
-                    x2, y2 = min(w, x2), min(h, y2)
-                    if x2 > x1 and y2 > y1:
-                        faces.append((x1, y1, x2 - x1, y2 - y1))
-            return faces
-        else:
-            # Fallback to Haar Cascade
-            gray = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2GRAY)
-            faces = detector.detectMultiScale(
-                gray,
-                scaleFactor=1.1,
-                minNeighbors=5,
-                minSize=(30, 30)
-            )
-            return [(int(x), int(y), int(w), int(h)) for x, y, w, h in faces]
+        # Same cap as _run_detector (the detector itself is this thread's own instance)
+        with _detect_semaphore:
+            if _detection_method.startswith("OpenCV DNN"):
+                h, w = frame_rgb.shape[:2]
+                blob = cv2.dnn.blobFromImage(
+                    cv2.resize(frame_rgb, (300, 300)),
+                    1.0,
+                    (300, 300),
+                    (104.0, 177.0, 123.0)
+                )
+                detector.setInput(blob)
+                detections = detector.forward()
+
+                faces = []
+                for i in range(detections.shape[2]):
+                    confidence = detections[0, 0, i, 2]
+                    if confidence > min_confidence:
+                        box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
+                        x1, y1, x2, y2 = box.astype("int")
+                        x1, y1 = max(0, x1), max(0, y1)
+                        x2, y2 = min(w, x2), min(h, y2)
+                        if x2 > x1 and y2 > y1:
+                            faces.append((x1, y1, x2 - x1, y2 - y1))
+                return faces
+            else:
+                # Fallback to Haar Cascade
+                gray = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2GRAY)
+                faces = detector.detectMultiScale(
+                    gray,
+                    scaleFactor=1.1,
+                    minNeighbors=5,
+                    minSize=(30, 30)
+                )
+                return [(int(x), int(y), int(w), int(h)) for x, y, w, h in faces]
 
     except Exception as e:
         logger.error(f'[FACE_DETECTION] Error detecting faces: {str(e)}')
@@ -359,6 +483,19 @@ def get_largest_face(image):
     return detect_and_crop_face(image, padding_percent=30, return_bbox=False)
 
 
+def warmup_face_detector():
+    """
+    Create the calling thread's detector and run it once on a blank image
+
+    Loads (and downloads, on first use) the model and lets OpenCV allocate its
+    buffers, so the first real frame on this thread does not pay for it.
+    """
+    try:
+        detect_face_bbox(np.zeros((DETECTOR_WARMUP_SIZE, DETECTOR_WARMUP_SIZE, 3), dtype=np.uint8))
+    except Exception as e:
+        logger.warning(f'[FACE_DETECTION] Detector warmup failed: {str(e)}')
+
+
 def get_detection_method():
     """Return the current face detection method being used"""
     global _detection_method
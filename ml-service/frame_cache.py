@@ -0,0 +1,171 @@
+"""
+Frame Cache Module
+Persists preprocessed video frames on disk, keyed by media hash
+
+Re-analysing a video that was seen before (after a restart, or once its result
+fell out of the in-memory result cache) skips frame decoding, face detection
+and normalization: the stored pixel values are memory-mapped back and fed
+straight to the model. Entries keep the exact tensor the first request fed
+(dtype included), so a hit scores the same as the miss that stored it.
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+import threading
+import torch
+
+logger = logging.getLogger(__name__)
+
+# FRAME_CACHE_DIR: directory for cached frame tensors (caching disabled if unset)
+FRAME_CACHE_DIR = os.environ.get('FRAME_CACHE_DIR', '')
+# FRAME_CACHE_MAX_MB: size bound of FRAME_CACHE_DIR; least recently used entries are removed past it
+FRAME_CACHE_MAX_MB = float(os.environ.get('FRAME_CACHE_MAX_MB', 4096))
+
+
+class CacheSizeLimit:
+    """
+    Keeps a cache directory under a size bound by removing least recently used files
+
+    Files are ordered by mtime (cache hits touch their entry). The directory is
+    scanned once, then only this process's writes are counted; when the count
+    passes the bound the directory is rescanned and pruned to 90% of it, so
+    several worker processes sharing a directory keep it near the bound.
+
+    Args:
+        directory: Cache directory
+        max_bytes: Size bound in bytes
+        log_prefix: Module tag for log messages (default: [FRAME_CACHE])
+    """
+
+    def __init__(self, directory, max_bytes, log_prefix='[FRAME_CACHE]'):
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._log_prefix = log_prefix
+        self._used = None
+        self._lock = threading.Lock()
+
+    def touch(self, path):
+        """Mark a cache entry as recently used"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def add(self, num_bytes):
+        """Account for a newly written entry, pruning the directory if it grew past the bound"""
+        with self._lock:
+            if self._used is None:
+                # First write of this process - the scan already includes the new entry
+                self._used = sum(size for _, _, size in self._scan())
+            else:
+                self._used += num_bytes
+            if self._used > self._max_bytes:
+                self._used = self._prune()
+
+    def _scan(self):
+        """List (mtime, path, size) for every finished entry in the directory"""
+        entries = []
+        with os.scandir(self._directory) as it:
+            for entry in it:
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, entry.path, stat.st_size))
+        return entries
+
+    def _prune(self):
+        """Remove the oldest entries until the directory is under 90% of the bound"""
+        entries = sorted(self._scan())
+        used = sum(size for _, _, size in entries)
+        target = self._max_bytes * 0.9
+        removed = 0
+        for _, path, size in entries:
+            if used <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            used -= size
+            removed += 1
+        logger.info(f'{self._log_prefix} Pruned {removed} entries from {self._directory} ({used / (1024 * 1024):.0f} MB left)')
+        return used
+
+
+_size_limit = CacheSizeLimit(FRAME_CACHE_DIR, FRAME_CACHE_MAX_MB * 1024 * 1024)
+
+
+def is_frame_cache_enabled():
+    """Check if preprocessed frames are cached on disk"""
+    return bool(FRAME_CACHE_DIR)
+
+
+def _cache_path(hash_value, model_version, signature):
+    """Get the cache file path for a media hash / model version / preprocessing signature"""
+    key = hashlib.sha256(f'{hash_value}:{model_version}:{signature}'.encode()).hexdigest()
+    return os.path.join(FRAME_CACHE_DIR, f'{key}.pt')
+
+
+def load_frames(hash_value, model_version, signature=''):
+    """
+    Load cached frames for a video
+
+    Args:
+        hash_value: Media hash from the request
+        model_version: Model version from the request
+        signature: Frame selection / preprocessing settings the frames were built with
+
+    Returns:
+        tuple: (pixel_values CPU tensor (N, 3, H, W) backed by a memory map,
+        list of bool face flags) or None on a cache miss
+    """
+    cache_path = _cache_path(hash_value, model_version, signature)
+    try:
+        cached = torch.load(cache_path, map_location='cpu', mmap=True, weights_only=True)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f'[FRAME_CACHE] Ignoring unreadable cache entry for hash={hash_value[:16]}...: {str(e)}')
+        return None
+
+    _size_limit.touch(cache_path)
+    logger.info(f'[FRAME_CACHE] Hit for hash={hash_value[:16]}... ({cached["pixel_values"].shape[0]} frames)')
+    return cached['pixel_values'], cached['face_flags'].tolist()
+
+
+def save_frames(hash_value, model_version, pixel_values, face_flags, signature=''):
+    """
+    Store preprocessed frames for a video
+
+    The file is written under a temporary name and renamed into place so
+    concurrent workers never read a partial entry.
+
+    Args:
+        hash_value: Media hash from the request
+        model_version: Model version from the request
+        pixel_values: float tensor (N, 3, H, W) on any device, stored as is
+        face_flags: List of bool face-detected flags (one per frame)
+        signature: Frame selection / preprocessing settings the frames were built with
+    """
+    cache_path = _cache_path(hash_value, model_version, signature)
+    try:
+        os.makedirs(FRAME_CACHE_DIR, exist_ok=True)
+        entry = {
+            'pixel_values': pixel_values.detach().to('cpu').contiguous(),
+            'face_flags': torch.tensor(face_flags, dtype=torch.bool)
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=FRAME_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                torch.save(entry, f)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        _size_limit.add(os.path.getsize(cache_path))
+    except Exception as e:
+        logger.warning(f'[FRAME_CACHE] Failed to cache frames for hash={hash_value[:16]}...: {str(e)}')
@@ -0,0 +1,287 @@
+"""
+GPU Preprocessing Module
+Decodes JPEG video frames with nvJPEG and builds model inputs on the GPU
+(resize + normalize also runs on the GPU for images preprocessed on the CPU)
+
+Frames never go through PIL: the raw JPEG bytes are decoded straight into CUDA
+tensors, face detection runs on a 300x300 copy (the resolution the OpenCV DNN
+detector works at anyway), and crop + resize + normalize happen on the GPU.
+"""
+
+import os
+import logging
+import numpy as np
+import torch
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Try to import torchvision GPU decode - graceful fallback to the PIL path if not available
+try:
+    import torchvision.transforms.functional as TF
+    from torchvision.io import decode_jpeg, read_file, ImageReadMode
+    TORCHVISION_AVAILABLE = True
+except ImportError:
+    TORCHVISION_AVAILABLE = False
+    logger.warning('[GPU_PREPROCESSING] torchvision.io not available - GPU frame decoding disabled')
+
+try:
+    from face_detection import detect_face_bbox, compute_crop_box, get_detection_method
+    FACE_DETECTION_AVAILABLE = True
+except ImportError:
+    FACE_DETECTION_AVAILABLE = False
+
+# GPU_DECODE: auto (use when CUDA + torchvision are available) | false
+GPU_DECODE = os.environ.get('GPU_DECODE', 'auto').lower()
+
+# Input size of the OpenCV DNN face detector
+DETECTOR_SIZE = 300
+
+JPEG_MAGIC = b'\xff\xd8'
+
+# HF image processors store PIL resample filters (PILImageResampling values);
+# tensor resize has no LANCZOS / BOX / HAMMING - use the closest tensor mode
+_RESAMPLE_TO_INTERPOLATION = {
+    0: 'NEAREST_EXACT',  # NEAREST (PIL rounds like nearest-exact)
+    1: 'BICUBIC',        # LANCZOS
+    2: 'BILINEAR',       # BILINEAR
+    3: 'BICUBIC',        # BICUBIC
+    4: 'BILINEAR',       # BOX
+    5: 'BILINEAR',       # HAMMING
+}
+
+
+def is_gpu_decode_available():
+    """Check if frames can be decoded and preprocessed on the GPU"""
+    return GPU_DECODE != 'false' and TORCHVISION_AVAILABLE and torch.cuda.is_available()
+
+
+def _get_target_size(image_processor):
+    """Get the (height, width) the model expects, or None if the processor uses another scheme"""
+    size = getattr(image_processor, 'size', None) or {}
+    if 'height' in size and 'width' in size:
+        return size['height'], size['width']
+    return None
+
+
+def _get_interpolation(image_processor):
+    """Get the torchvision interpolation mode matching the processor's resample filter"""
+    # BaseImageProcessor defaults to BILINEAR when a processor sets no filter
+    resample = getattr(image_processor, 'resample', None)
+    name = _RESAMPLE_TO_INTERPOLATION.get(int(resample) if resample is not None else 2, 'BILINEAR')
+    return getattr(TF.InterpolationMode, name)
+
+
+def decode_frames(frame_paths, device):
+    """
+    Decode JPEG frames directly into CUDA tensors
+
+    Frames in other formats (PNG, BMP, ...) are decoded on the CPU and moved to
+    the device, so every readable frame is kept in its original order.
+
+    Args:
+        frame_paths: List of frame file paths
+        device: torch device to decode onto
+
+    Returns:
+        List of uint8 tensors (3, H, W) and list of paths that decoded successfully
+    """
+    raw_frames = []
+    read_paths = []
+    for path in frame_paths:
+        try:
+            data = read_file(path)
+        except Exception as e:
+            logger.warning(f'[GPU_PREPROCESSING] Skipping unreadable frame {path}: {str(e)}')
+            continue
+        raw_frames.append(data)
+        read_paths.append(path)
+
+    jpeg_indices = [i for i, data in enumerate(raw_frames) if bytes(data[:2].tolist()) == JPEG_MAGIC]
+    decoded = [None] * len(raw_frames)
+
+    if jpeg_indices:
+        try:
+            # Batched decode (torchvision >= 0.19)
+            batch = decode_jpeg([raw_frames[i] for i in jpeg_indices], mode=ImageReadMode.RGB, device=device)
+            for i, frame in zip(jpeg_indices, batch):
+                decoded[i] = frame
+        except Exception:
+            for i in jpeg_indices:
+                try:
+                    decoded[i] = decode_jpeg(raw_frames[i], mode=ImageReadMode.RGB, device=device)
+                except Exception as e:
+                    logger.warning(f'[GPU_PREPROCESSING] Skipping invalid frame {read_paths[i]}: {str(e)}')
+
+    jpeg_set = set(jpeg_indices)
+    for i, data in enumerate(raw_frames):
+        if i in jpeg_set:
+            continue
+        # nvJPEG only handles JPEG - decode other formats on the CPU, with PIL like the CPU path
+        try:
+            with Image.open(read_paths[i]) as image:
+                rgb = np.asarray(image.convert('RGB'))
+            decoded[i] = torch.from_numpy(rgb).permute(2, 0, 1).to(device)
+        except Exception as e:
+            logger.warning(f'[GPU_PREPROCESSING] Skipping invalid frame {read_paths[i]}: {str(e)}')
+
+    frames = [frame for frame in decoded if frame is not None]
+    valid_paths = [path for frame, path in zip(decoded, read_paths) if frame is not None]
+    return frames, valid_paths
+
+
+def crop_faces(frames, padding_percent=30):
+    """
+    Crop the largest face out of each decoded frame
+
+    Detection runs on the CPU against a single batched download of 300x300
+    copies; the crop itself is a view of the full-resolution GPU frame.
+
+    Args:
+        frames: List of uint8 CUDA tensors (3, H, W)
+        padding_percent: Percentage of padding to add around face (default: 30%)
+
+    Returns:
+        List of cropped CUDA tensors and list of bool face-found flags
+    """
+    small = torch.stack([
+        TF.resize(frame, [DETECTOR_SIZE, DETECTOR_SIZE], antialias=False) for frame in frames
+    ])
+    small_np = small.permute(0, 2, 3, 1).contiguous().cpu().numpy()
+
+    crops = []
+    face_flags = []
+    for frame, small_rgb in zip(frames, small_np):
+        img_h, img_w = frame.shape[1:]
+        face_bbox = detect_face_bbox(small_rgb)
+
+        if face_bbox is None:
+            crops.append(frame)
+            face_flags.append(False)
+            continue
+
+        scale_x = img_w / DETECTOR_SIZE
+        scale_y = img_h / DETECTOR_SIZE
+        x, y, w, h = face_bbox
+        scaled_bbox = (x * scale_x, y * scale_y, w * scale_x, h * scale_y)
+        x1, y1, x2, y2 = compute_crop_box(scaled_bbox, img_w, img_h, padding_percent)
+        crops.append(frame[:, y1:y2, x1:x2])
+        face_flags.append(True)
+
+    return crops, face_flags
+
+
+def to_pixel_values(images, image_processor, target_size, dtype=torch.float32):
+    """
+    Resize, rescale and normalize uint8 image tensors on the GPU
+
+    Mirrors the HF image processor (resize to a fixed size with its resample
+    filter, rescale, normalize) so the result can be fed to the model as
+    pixel_values. The math runs in float32; the result is cast at the end.
+
+    Args:
+        images: List of uint8 CUDA tensors (3, H, W)
+        image_processor: HF image processor of the loaded pipeline
+        target_size: (height, width) expected by the model
+        dtype: Output dtype - the model's dtype (default: float32)
+
+    Returns:
+        Tensor (N, 3, height, width) of dtype on the GPU
+    """
+    interpolation = _get_interpolation(image_processor)
+    resized = torch.stack([
+        TF.resize(image, list(target_size), interpolation=interpolation, antialias=True)
+        for image in images
+    ])
+    pixel_values = resized.float()
+
+    if getattr(image_processor, 'do_rescale', True):
+        pixel_values.mul_(getattr(image_processor, 'rescale_factor', 1 / 255))
+
+    if getattr(image_processor, 'do_normalize', True):
+        mean = torch.tensor(image_processor.image_mean, device=pixel_values.device).view(1, 3, 1, 1)
+        std = torch.tensor(image_processor.image_std, device=pixel_values.device).view(1, 3, 1, 1)
+        pixel_values.sub_(mean).div_(std)
+
+    return pixel_values.to(dtype)
+
+
+def images_to_pixel_values(images, image_processor, device, dtype=torch.float32):
+    """
+    Build model inputs from already-preprocessed PIL images on the GPU
+
+    Images are uploaded as uint8 (a quarter of the float32 bytes), packed into
+    one pinned staging buffer so the batch is a single host-to-device copy,
+    then resized and normalized on the device.
+
+    Args:
+        images: List of PIL Images (RGB)
+        image_processor: HF image processor of the loaded pipeline
+        device: torch device the model runs on
+        dtype: Output dtype - the model's dtype (default: float32)
+
+    Returns:
+        Tensor (N, 3, height, width) of dtype on the GPU, or None if the
+        processor uses a resize scheme the GPU path does not mirror
+    """
+    target_size = _get_target_size(image_processor)
+    if target_size is None:
+        return None
+
+    arrays = [np.asarray(image) for image in images]
+    staging = torch.empty(sum(array.size for array in arrays), dtype=torch.uint8, pin_memory=torch.cuda.is_available())
+    staging_np = staging.numpy()
+
+    # Images have different sizes (face crops) - write each one at its offset
+    offsets = []
+    offset = 0
+    for array in arrays:
+        staging_np[offset:offset + array.size] = array.reshape(-1)
+        offsets.append(offset)
+        offset += array.size
+
+    flat = staging.to(device, non_blocking=True)
+    uploaded = [
+        flat[start:start + array.size].view(array.shape).permute(2, 0, 1)
+        for start, array in zip(offsets, arrays)
+    ]
+    return to_pixel_values(uploaded, image_processor, target_size, dtype)
+
+
+def preprocess_frames_gpu(frame_paths, image_processor, device, detect_faces=True, dtype=torch.float32):
+    """
+    Full GPU preprocessing pipeline for video frames
+
+    Args:
+        frame_paths: List of frame file paths (already sampled)
+        image_processor: HF image processor of the loaded pipeline
+        device: torch device the model runs on
+        detect_faces: If True, crop the largest face from each frame (default: True)
+        dtype: Dtype of the returned pixel values - the model's dtype (default: float32)
+
+    Returns:
+        tuple: (pixel_values, valid_paths, face_flags) or None if the GPU path
+        cannot handle this model / detector (caller should use the PIL path)
+    """
+    target_size = _get_target_size(image_processor)
+    if target_size is None:
+        logger.info('[GPU_PREPROCESSING] Image processor size not supported on GPU path')
+        return None
+
+    if detect_faces and not (FACE_DETECTION_AVAILABLE and get_detection_method().startswith('OpenCV DNN')):
+        # Haar fallback needs the full-resolution grayscale frame - use the PIL path
+        return None
+
+    frames, valid_paths = decode_frames(frame_paths, device)
+    if not frames:
+        return None
+
+    if detect_faces:
+        images, face_flags = crop_faces(frames)
+    else:
+        images, face_flags = frames, [False] * len(frames)
+
+    pixel_values = to_pixel_values(images, image_processor, target_size, dtype)
+    logger.info(f'[GPU_PREPROCESSING] Preprocessed {len(valid_paths)} frames on GPU, faces={sum(face_flags)}')
+
+    return pixel_values, valid_paths, face_flags
@@ -0,0 +1,55 @@
+"""
+Gunicorn configuration for the ML service
+
+Runs the Flask app with threaded (gthread) workers so concurrent requests are
+served in parallel and can share forward passes through the batch scheduler.
+
+- CPU hosts: several workers, model loaded once in the master (preload_app) and
+  shared copy-on-write with the forked workers
+- GPU hosts: a single worker that loads the model itself - CUDA contexts do not
+  survive fork, and one process keeps a single copy of the weights on the GPU
+"""
+
+import os
+import multiprocessing
+
+
+def _cuda_available():
+    """
+    Check for a GPU without importing torch
+
+    Importing torch (and numpy) here would size their thread pools before app.py
+    sets OMP_NUM_THREADS / MKL_NUM_THREADS, and a preloading master would hand
+    those pools to every forked worker. ML_DEVICE=cuda|cpu skips the probe.
+    """
+    device = os.environ.get('ML_DEVICE', 'auto').lower()
+    if device != 'auto':
+        return device == 'cuda'
+    if os.environ.get('CUDA_VISIBLE_DEVICES', None) in ('', '-1'):
+        return False
+    return os.path.exists('/dev/nvidiactl')
+
+
+_cuda = _cuda_available()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', 1 if _cuda else max(1, multiprocessing.cpu_count() // 4)))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false' if _cuda else 'true').lower() == 'true'
+
+# Model compilation / downloads can make the first requests slow
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 300))
+
+# app.py splits CPU threads between workers based on this
+os.environ['WEB_CONCURRENCY'] = str(workers)
+# ...and loads the audio model inline (instead of in a thread) when preloading
+os.environ['GUNICORN_PRELOAD'] = 'true' if preload_app else 'false'
+
+
+def post_fork(server, worker):
+    """Re-create the torch thread pool and log listener thread in each forked worker"""
+    if preload_app:
+        from app import configure_torch_threads, configure_logging
+        configure_torch_threads()
+        configure_logging()
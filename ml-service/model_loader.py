@@ -6,12 +6,31 @@ Loads and manages deepfake detection models:
 """
 
 import os
+import time
+import threading
+import contextlib
+import importlib.util
 import torch
 import logging
-from transformers import pipeline
+from PIL import Image
+
+# Download model snapshots over parallel connections when hf_transfer is installed
+# (read by huggingface_hub at import time, so set before transformers is imported)
+if importlib.util.find_spec('hf_transfer') is not None:
+    os.environ.setdefault('HF_HUB_ENABLE_HF_TRANSFER', '1')
+
+from transformers import pipeline, AutoImageProcessor, AutoFeatureExtractor
+from transformers.modeling_outputs import ImageClassifierOutput
 
 logger = logging.getLogger(__name__)
 
+# Try to import ONNX Runtime support - graceful fallback to PyTorch if not available
+try:
+    from optimum.onnxruntime import ORTModelForImageClassification, ORTModelForAudioClassification
+    ONNX_RUNTIME_AVAILABLE = True
+except ImportError:
+    ONNX_RUNTIME_AVAILABLE = False
+
 # Image model configuration
 LOCAL_MODEL_PATH = "/app/model"
 MODEL_ID_HF = "prithivMLmods/deepfake-detector-model-v1"
@@ -20,18 +39,55 @@ MODEL_ID_HF = "prithivMLmods/deepfake-detector-model-v1"
 LOCAL_AUDIO_MODEL_PATH = "/app/audio_model"
 AUDIO_MODEL_ID_HF = "Gustking/wav2vec2-large-xlsr-deepfake-audio-classification"
 
+# Inference optimization settings
+# ML_DEVICE: auto (GPU when available) | cuda | cpu
+ML_DEVICE = os.environ.get('ML_DEVICE', 'auto').lower()
+# MODEL_BACKEND: torch (HF PyTorch models) | onnx (ONNX Runtime with TensorRT/CUDA/CPU providers,
+# applies to both the image and the audio model)
+MODEL_BACKEND = os.environ.get('MODEL_BACKEND', 'torch').lower()
+ONNX_MODEL_DIR = os.environ.get('ONNX_MODEL_DIR', '/app/model_onnx')
+ONNX_AUDIO_MODEL_DIR = os.environ.get('ONNX_AUDIO_MODEL_DIR', '/app/audio_model_onnx')
+# ONNX_QUANTIZE: auto (INT8 model on CPU) | false
+# ONNX_CALIBRATION_DIR: images for static INT8 calibration (dynamic quantization if unset/empty)
+ONNX_QUANTIZE = os.environ.get('ONNX_QUANTIZE', 'auto').lower()
+ONNX_CALIBRATION_DIR = os.environ.get('ONNX_CALIBRATION_DIR', '')
+ONNX_CALIBRATION_SIZE = int(os.environ.get('ONNX_CALIBRATION_SIZE', 100))
+ONNX_INT8_FILE = 'model_int8.onnx'
+# Largest batch the service runs (same setting app.py packs video frames with);
+# TensorRT engines are built for batches of 1..INFERENCE_BATCH_SIZE, tuned for the maximum
+INFERENCE_BATCH_SIZE = int(os.environ.get('INFERENCE_BATCH_SIZE', 16))
+# MODEL_PRECISION: auto (bf16 on CUDA when supported, else fp16; fp32 on CPU) | fp32 | bf16 | fp16 (CUDA) | int8 (CPU, dynamic)
+# MODEL_COMPILE: auto (compile on CUDA only) | true | false
+MODEL_PRECISION = os.environ.get('MODEL_PRECISION', 'auto').lower()
+MODEL_COMPILE = os.environ.get('MODEL_COMPILE', 'auto').lower()
+MODEL_COMPILE_MODE = os.environ.get('MODEL_COMPILE_MODE', 'max-autotune')
+# MODEL_JIT: auto (freeze a TorchScript trace on CPU when not compiled) | true | false
+MODEL_JIT = os.environ.get('MODEL_JIT', 'auto').lower()
+
 # Global instances (singleton pattern)
 _pipeline = None
 _audio_pipeline = None
 _device = None
 _audio_model_loaded = False
+_model_dtype = None
+_model_compiled = False
+_model_frozen = False
+_model_backend = 'torch'
+_model_quantized = False
+_audio_model_backend = 'torch'
+_audio_label_table = {}
+_load_lock = threading.Lock()
+_audio_load_lock = threading.Lock()
+_fake_label_index = None
 
 
 def get_device():
     """Get the appropriate device (CPU or GPU)"""
     global _device
     if _device is None:
-        if torch.cuda.is_available():
+        if ML_DEVICE == 'cpu':
+            _device = -1
+        elif torch.cuda.is_available():
             _device = 0  # GPU device ID
         else:
             _device = -1  # CPU
@@ -39,19 +95,534 @@ def get_device():
     return _device
 
 
+def get_model_dtype():
+    """Get the torch dtype the image and audio models run in"""
+    global _model_dtype
+    if _model_dtype is None:
+        device = get_device()
+        if MODEL_BACKEND == 'onnx' and ONNX_RUNTIME_AVAILABLE:
+            # ONNX Runtime manages its own precision (fp16 via TensorRT provider)
+            _model_dtype = torch.float32
+        elif MODEL_PRECISION == 'bf16':
+            _model_dtype = torch.bfloat16
+        elif MODEL_PRECISION == 'fp16' and device >= 0:
+            _model_dtype = torch.float16
+        elif MODEL_PRECISION == 'auto' and device >= 0:
+            # Tensor-core precision: bf16 on Ampere+, fp16 on older GPUs (Volta/Turing).
+            # is_bf16_supported() also reports emulated bf16 on pre-Ampere GPUs, so
+            # check for native support via the compute capability instead
+            _model_dtype = torch.bfloat16 if torch.cuda.get_device_capability(device)[0] >= 8 else torch.float16
+        else:
+            _model_dtype = torch.float32
+        logger.info(f'[MODEL_LOADER] Model precision: {str(_model_dtype).replace("torch.", "")}')
+    return _model_dtype
+
+
+def _should_compile(device):
+    """Check whether the image model should be wrapped with torch.compile"""
+    if _model_backend != 'torch':
+        return False
+    if MODEL_COMPILE in ('1', 'true', 'yes'):
+        return True
+    if MODEL_COMPILE == 'auto':
+        return device >= 0
+    return False
+
+
+def _compile_model(image_pipeline, device):
+    """
+    Wrap the pipeline model with torch.compile (kernel fusion + CUDA graphs)
+
+    Compilation is lazy, so failures only surface on the first forward pass;
+    warmup_model() reverts to the eager model in that case.
+    """
+    global _model_compiled
+
+    if not _should_compile(device) or not hasattr(torch, 'compile'):
+        return
+
+    try:
+        image_pipeline.model = torch.compile(image_pipeline.model, mode=MODEL_COMPILE_MODE)
+        _model_compiled = True
+        logger.info(f'[MODEL_LOADER] Model wrapped with torch.compile (mode={MODEL_COMPILE_MODE})')
+    except Exception as e:
+        logger.warning(f'[MODEL_LOADER] torch.compile unavailable, using eager model: {str(e)}')
+        _model_compiled = False
+
+
+class _LogitsModule(torch.nn.Module):
+    """Adapter returning only the logits tensor, so the HF model can be traced"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values):
+        return self.model(pixel_values=pixel_values).logits
+
+
+class _FrozenImageModel(torch.nn.Module):
+    """Frozen TorchScript image model behind the HF model interface the pipeline uses"""
+
+    def __init__(self, frozen, model):
+        super().__init__()
+        self.frozen = frozen
+        self.config = model.config
+        self._device = model.device
+        self._dtype = model.dtype
+
+    @property
+    def device(self):
+        return self._device
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    def forward(self, pixel_values, **kwargs):
+        return ImageClassifierOutput(logits=self.frozen(pixel_values))
+
+
+def _should_freeze(device):
+    """Check whether the image model should be replaced by a frozen TorchScript trace"""
+    if _model_backend != 'torch' or _model_compiled:
+        return False
+    if MODEL_JIT in ('1', 'true', 'yes'):
+        return True
+    if MODEL_JIT == 'auto':
+        return device < 0
+    return False
+
+
+def _freeze_model(image_pipeline, device):
+    """
+    Trace, freeze and optimize_for_inference the image model (eager CPU inference)
+
+    Freezing inlines the weights as constants so constant folding and the
+    oneDNN fusion passes run once at load time instead of per-op dispatch on
+    every request. Not every HF model traces cleanly, so the trace is checked
+    against the eager model (at two batch sizes) and dropped on any mismatch.
+    """
+    global _model_frozen
+
+    if not _should_freeze(device):
+        return
+
+    model = image_pipeline.model
+    size = getattr(model.config, 'image_size', 224)
+    example = torch.rand(2, 3, size, size, dtype=model.dtype, device=model.device)
+
+    try:
+        # Grad mode is per thread - the loading thread may have it enabled
+        with torch.no_grad():
+            traced = torch.jit.trace(_LogitsModule(model).eval(), example, check_trace=False)
+            frozen = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+
+            for batch in (example[:1], torch.cat([example, example[:1]])):
+                expected = model(pixel_values=batch).logits
+                if not torch.allclose(frozen(batch), expected, atol=1e-3, rtol=1e-3):
+                    raise ValueError(f'frozen model output differs from eager (batch={batch.shape[0]})')
+
+        image_pipeline.model = _FrozenImageModel(frozen, model)
+        _model_frozen = True
+        logger.info('[MODEL_LOADER] Image model frozen with TorchScript (optimize_for_inference)')
+    except Exception as e:
+        logger.warning(f'[MODEL_LOADER] TorchScript freeze failed, using eager model: {str(e)}')
+        _model_frozen = False
+
+
+def _find_fake_label_index(id2label):
+    """
+    Find the 'fake' class in the model's label table
+
+    Uses the same label rules as app.extract_fake_probability ('fake' or LABEL_0
+    is fake; for a binary model the class opposite 'real'/LABEL_1 is fake).
+
+    Returns:
+        Class index, or None if the labels cannot be told apart
+    """
+    labels = {int(index): str(label).lower() for index, label in id2label.items()}
+    for index, label in labels.items():
+        if 'fake' in label or label == 'label_0':
+            return index
+    if len(labels) == 2:
+        for index, label in labels.items():
+            if 'real' in label or label == 'label_1':
+                return next(other for other in labels if other != index)
+    return None
+
+
+def get_fake_label_index():
+    """Get the class index of the 'fake' label of the image model (None if unknown)"""
+    return _fake_label_index
+
+
+def _quantize_model(image_pipeline, device):
+    """
+    Dynamically quantize the image model's Linear layers to INT8 (MODEL_PRECISION=int8)
+
+    Weights are stored as int8 and activations quantized on the fly, so the
+    transformer GEMMs run as int8 kernels (VNNI on x86). CPU only.
+    """
+    global _model_quantized
+
+    if MODEL_PRECISION != 'int8':
+        return
+    if device >= 0:
+        logger.warning('[MODEL_LOADER] MODEL_PRECISION=int8 is only supported on CPU, using fp32')
+        return
+
+    image_pipeline.model = torch.ao.quantization.quantize_dynamic(
+        image_pipeline.model,
+        {torch.nn.Linear},
+        dtype=torch.qint8
+    )
+    _model_quantized = True
+    logger.info('[MODEL_LOADER] Image model dynamically quantized to INT8')
+
+
+def _build_audio_label_table(id2label):
+    """
+    Classify each raw audio label once: True for fake/spoof, False for real/bonafide
+
+    Labels matching neither are left out (the caller falls back to matching them).
+    """
+    table = {}
+    for label in id2label.values():
+        lowered = str(label).lower()
+        if 'fake' in lowered or 'spoof' in lowered:
+            table[label] = True
+        elif 'real' in lowered or 'bonafide' in lowered:
+            table[label] = False
+    return table
+
+
+def get_audio_label_table():
+    """Get the {raw label: is_fake} table of the audio model (empty until it is loaded)"""
+    return _audio_label_table
+
+
+def get_model_backend():
+    """Get the runtime serving the image model ('torch' or 'onnx')"""
+    return _model_backend
+
+
+def is_model_compiled():
+    """Check if the image model is running through torch.compile"""
+    return _model_compiled
+
+
+def inference_context():
+    """
+    Context manager for image model forward passes
+
+    Disables autograd bookkeeping and autocasts to the model precision so
+    fp32 pixel values coming out of the image processor match bf16 weights.
+    Grad mode is thread-local, so every forward pass (request threads, the
+    batch scheduler worker, warmup) has to run inside this context.
+    """
+    stack = contextlib.ExitStack()
+    stack.enter_context(torch.inference_mode())
+    dtype = get_model_dtype()
+    if dtype != torch.float32:
+        device_type = 'cuda' if get_device() >= 0 else 'cpu'
+        stack.enter_context(torch.autocast(device_type, dtype=dtype))
+    return stack
+
+
+def warmup_model(batch_size, forward_fn=None):
+    """
+    Run dummy batches through the image pipeline so the first real request
+    does not pay compilation / kernel selection cost
+
+    Args:
+        batch_size: Batch size used for video frames (warmed up alongside batch=1).
+            These are the only shapes a compiled model runs at: run_inference
+            pads partial batches of 2+ images to batch_size, single images run at 1
+        forward_fn: Callable taking float32 pixel values (N, 3, H, W) - the request
+            path's own forward (app submits to its batch scheduler, which runs
+            run_inference_tensor on the worker thread requests use), so warmup
+            and requests hit the same guards on the same thread. Defaults to
+            calling the model directly.
+    """
+    global _model_compiled
+
+    if _pipeline is None:
+        return
+
+    dummy = Image.new('RGB', (224, 224))
+    start = time.time()
+    try:
+        with inference_context():
+            if _model_backend == 'torch':
+                model = _pipeline.model
+                pixel_values = _pipeline.image_processor(dummy, return_tensors='pt')['pixel_values']
+                for size in (1, batch_size):
+                    batch = pixel_values.expand(size, -1, -1, -1).contiguous()
+                    if forward_fn is not None:
+                        forward_fn(batch)
+                    else:
+                        model(pixel_values=batch.to(model.device, dtype=model.dtype, memory_format=torch.channels_last))
+                if model.device.type == 'cuda':
+                    torch.cuda.synchronize()
+            else:
+                _pipeline(dummy)
+                _pipeline([dummy] * batch_size, batch_size=batch_size)
+        logger.info(f'[MODEL_LOADER] Warmup complete in {time.time() - start:.2f}s')
+    except Exception as e:
+        if not _model_compiled:
+            logger.warning(f'[MODEL_LOADER] Warmup failed: {str(e)}')
+            return
+        # Compiled forward failed (e.g. no Triton/C++ toolchain) - fall back to eager
+        logger.warning(f'[MODEL_LOADER] Compiled model failed during warmup, reverting to eager: {str(e)}')
+        _pipeline.model = getattr(_pipeline.model, '_orig_mod', _pipeline.model)
+        _model_compiled = False
+
+
+class _CalibrationReader:
+    """Feeds preprocessed calibration images to onnxruntime.quantization.quantize_static"""
+
+    def __init__(self, image_paths, image_processor):
+        self._image_paths = iter(image_paths)
+        self._image_processor = image_processor
+
+    def get_next(self):
+        from preprocessing import preprocess_image
+
+        for path in self._image_paths:
+            try:
+                image = preprocess_image(path)
+            except Exception as e:
+                logger.warning(f'[MODEL_LOADER] Skipping calibration image {path}: {str(e)}')
+                continue
+            return {'pixel_values': self._image_processor(images=[image], return_tensors='np')['pixel_values']}
+        return None
+
+
+def _get_calibration_images():
+    """List up to ONNX_CALIBRATION_SIZE image files from ONNX_CALIBRATION_DIR"""
+    if not ONNX_CALIBRATION_DIR or not os.path.isdir(ONNX_CALIBRATION_DIR):
+        return []
+    images = sorted(
+        entry.path for entry in os.scandir(ONNX_CALIBRATION_DIR)
+        if entry.is_file() and entry.name.lower().endswith(('.jpg', '.jpeg', '.png'))
+    )
+    return images[:ONNX_CALIBRATION_SIZE]
+
+
+def _quantize_onnx_model(image_processor):
+    """
+    Write an INT8 copy of the exported ONNX model for CPU inference
+
+    With calibration images the model is statically quantized (QDQ format,
+    u8 activations / s8 per-channel weights - the layout VNNI int8 dot products
+    run on); otherwise weights are quantized dynamically.
+
+    Args:
+        image_processor: HF image processor used to prepare calibration images
+
+    Returns:
+        Path of the INT8 ONNX model
+    """
+    from onnxruntime.quantization import quantize_dynamic, quantize_static, QuantFormat, QuantType
+
+    fp32_path = os.path.join(ONNX_MODEL_DIR, 'model.onnx')
+    int8_path = os.path.join(ONNX_MODEL_DIR, ONNX_INT8_FILE)
+    if os.path.exists(int8_path):
+        return int8_path
+
+    calibration_images = _get_calibration_images()
+    start = time.time()
+    if calibration_images:
+        logger.info(f'[MODEL_LOADER] Static INT8 quantization with {len(calibration_images)} calibration images...')
+        quantize_static(
+            fp32_path,
+            int8_path,
+            _CalibrationReader(calibration_images, image_processor),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True
+        )
+    else:
+        logger.info('[MODEL_LOADER] Dynamic INT8 quantization (no calibration images)...')
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+
+    logger.info(f'[MODEL_LOADER] Quantized ONNX model written to {int8_path} in {time.time() - start:.1f}s')
+    return int8_path
+
+
+def _select_onnx_provider(device, image_size=None):
+    """
+    Pick the fastest ONNX Runtime execution provider installed for the device
+
+    TensorRT -> CUDA -> CPU: onnxruntime-gpu builds without the TensorRT
+    libraries still run on the GPU through the CUDA provider.
+
+    Args:
+        device: Device id from get_device()
+        image_size: (height, width) of the model input, used to give TensorRT a
+            static optimization profile (dynamic shapes if None)
+
+    Returns:
+        tuple: (provider name, provider options or None)
+    """
+    import onnxruntime
+
+    available = onnxruntime.get_available_providers()
+    if device >= 0 and 'TensorrtExecutionProvider' in available:
+        options = {
+            'trt_fp16_enable': True,
+            'trt_engine_cache_enable': True,
+            'trt_engine_cache_path': os.path.join(ONNX_MODEL_DIR, 'trt_cache')
+        }
+        if image_size is not None:
+            # Only the batch dimension varies (1 for images, INFERENCE_BATCH_SIZE
+            # for video chunks) - kernels are picked for the full batch
+            height, width = image_size
+            options.update({
+                'trt_profile_min_shapes': f'pixel_values:1x3x{height}x{width}',
+                'trt_profile_opt_shapes': f'pixel_values:{INFERENCE_BATCH_SIZE}x3x{height}x{width}',
+                'trt_profile_max_shapes': f'pixel_values:{INFERENCE_BATCH_SIZE}x3x{height}x{width}'
+            })
+        return 'TensorrtExecutionProvider', options
+    if device >= 0 and 'CUDAExecutionProvider' in available:
+        # Inputs have fixed shapes, so the one-off exhaustive cuDNN search pays off
+        return 'CUDAExecutionProvider', {'cudnn_conv_algo_search': 'EXHAUSTIVE'}
+    if device >= 0:
+        logger.warning('[MODEL_LOADER] onnxruntime has no GPU provider installed, running ONNX model on CPU')
+    return 'CPUExecutionProvider', None
+
+
+def _load_onnx_pipeline(model_path, device):
+    """
+    Load the image model as an ONNX Runtime session wrapped in a HF pipeline
+
+    The model is exported to ONNX on first use and cached in ONNX_MODEL_DIR so
+    later starts skip the export. On CUDA the TensorRT provider runs the graph
+    in fp16 (engines cached next to the ONNX file); nodes it cannot handle fall
+    back to the CUDA and CPU providers. Without TensorRT the CUDA provider is
+    used directly. On CPU an INT8-quantized copy of the model is used unless
+    ONNX_QUANTIZE=false.
+
+    Args:
+        model_path: Local model directory or HuggingFace model id
+        device: Device id from get_device()
+
+    Returns:
+        Image classification pipeline backed by ONNX Runtime
+    """
+    global _model_quantized
+
+    export = not os.path.exists(os.path.join(ONNX_MODEL_DIR, 'model.onnx'))
+    source = model_path if export else ONNX_MODEL_DIR
+
+    image_processor = AutoImageProcessor.from_pretrained(model_path)
+    size = getattr(image_processor, 'size', None) or {}
+    image_size = (size['height'], size['width']) if 'height' in size and 'width' in size else None
+    provider, provider_options = _select_onnx_provider(device, image_size)
+
+    logger.info(f'[MODEL_LOADER] Loading ONNX model from {source} (export={export}, provider={provider})')
+    ort_model = ORTModelForImageClassification.from_pretrained(
+        source,
+        export=export,
+        provider=provider,
+        provider_options=provider_options
+    )
+
+    if export:
+        ort_model.save_pretrained(ONNX_MODEL_DIR)
+        logger.info(f'[MODEL_LOADER] Exported ONNX model to: {ONNX_MODEL_DIR}')
+
+    if provider == 'CPUExecutionProvider' and ONNX_QUANTIZE != 'false':
+        try:
+            import onnxruntime
+
+            int8_path = _quantize_onnx_model(image_processor)
+            session_options = onnxruntime.SessionOptions()
+            # Same per-worker share of cores torch was given
+            session_options.intra_op_num_threads = torch.get_num_threads()
+            ort_model = ORTModelForImageClassification.from_pretrained(
+                ONNX_MODEL_DIR,
+                file_name=os.path.basename(int8_path),
+                provider='CPUExecutionProvider',
+                session_options=session_options
+            )
+            _model_quantized = True
+            logger.info('[MODEL_LOADER] Using INT8 ONNX model on CPU')
+        except Exception as e:
+            logger.warning(f'[MODEL_LOADER] INT8 quantization failed, using FP32 ONNX model: {str(e)}')
+
+    return pipeline(
+        "image-classification",
+        model=ort_model,
+        image_processor=image_processor
+    )
+
+
+def _load_onnx_audio_pipeline(model_path, device):
+    """
+    Load the audio model as an ONNX Runtime session wrapped in a HF pipeline
+
+    Exported on first use and cached in ONNX_AUDIO_MODEL_DIR. Audio clips have
+    variable length, so the CUDA provider is used instead of TensorRT (which
+    would build an engine per input shape).
+
+    Args:
+        model_path: Local model directory or HuggingFace model id
+        device: Device id from get_device()
+
+    Returns:
+        Audio classification pipeline backed by ONNX Runtime
+    """
+    export = not os.path.exists(os.path.join(ONNX_AUDIO_MODEL_DIR, 'model.onnx'))
+    source = model_path if export else ONNX_AUDIO_MODEL_DIR
+    provider = 'CUDAExecutionProvider' if device >= 0 else 'CPUExecutionProvider'
+
+    logger.info(f'[MODEL_LOADER] Loading ONNX audio model from {source} (export={export}, provider={provider})')
+    ort_model = ORTModelForAudioClassification.from_pretrained(source, export=export, provider=provider)
+
+    if export:
+        ort_model.save_pretrained(ONNX_AUDIO_MODEL_DIR)
+        logger.info(f'[MODEL_LOADER] Exported ONNX audio model to: {ONNX_AUDIO_MODEL_DIR}')
+
+    return pipeline(
+        "audio-classification",
+        model=ort_model,
+        feature_extractor=AutoFeatureExtractor.from_pretrained(model_path)
+    )
+
+
 def load_model():
     """
     Load the deepfake-detector-model-v1 model using pipeline
 
+    Safe to call from several threads: the model is only loaded once.
+
     Returns:
         Loaded pipeline for image classification
     """
-    global _pipeline
-
     if _pipeline is not None:
         logger.info('[MODEL_LOADER] Model already loaded, returning cached instance')
         return _pipeline
 
+    with _load_lock:
+        if _pipeline is not None:
+            return _pipeline
+        return _load_image_pipeline()
+
+
+def _load_image_pipeline():
+    """
+    Load the image pipeline (caller holds _load_lock)
+
+    The pipeline is only published to _pipeline once quantization, compilation
+    and freezing are done, so other threads never see a half-configured model.
+    """
+    global _pipeline, _model_backend, _fake_label_index
+
+    image_pipeline = None
+
     try:
         device = get_device()
 
@@ -65,15 +636,37 @@ def load_model():
 
         logger.info(f'[MODEL_LOADER] Loading model: {model_path}')
 
-        # Use pipeline for simple and reliable loading
-        # The pipeline handles model and processor loading automatically
-        _pipeline = pipeline(
-            "image-classification",
-            model=model_path,
-            device=device
-        )
-
-        logger.info('[MODEL_LOADER] Model loaded successfully')
+        if MODEL_BACKEND == 'onnx':
+            if ONNX_RUNTIME_AVAILABLE:
+                try:
+                    image_pipeline = _load_onnx_pipeline(model_path, device)
+                    _model_backend = 'onnx'
+                except Exception as e:
+                    logger.warning(f'[MODEL_LOADER] ONNX Runtime load failed, falling back to PyTorch: {str(e)}')
+            else:
+                logger.warning('[MODEL_LOADER] MODEL_BACKEND=onnx but optimum[onnxruntime] is not installed, using PyTorch')
+
+        if image_pipeline is None:
+            # Use pipeline for simple and reliable loading
+            # The pipeline handles model and processor loading automatically
+            image_pipeline = pipeline(
+                "image-classification",
+                model=model_path,
+                device=device,
+                torch_dtype=get_model_dtype()
+            )
+            image_pipeline.model.eval()
+            # NHWC weights for the patch-embedding convolution (native cuDNN/oneDNN layout)
+            image_pipeline.model.to(memory_format=torch.channels_last)
+            _model_backend = 'torch'
+
+            _quantize_model(image_pipeline, device)
+            _compile_model(image_pipeline, device)
+            _freeze_model(image_pipeline, device)
+
+        _fake_label_index = _find_fake_label_index(image_pipeline.model.config.id2label)
+        _pipeline = image_pipeline
+        logger.info(f'[MODEL_LOADER] Model loaded successfully (fake label index: {_fake_label_index})')
         return _pipeline
 
     except Exception as e:
@@ -105,15 +698,34 @@ def load_audio_model():
     """
     Load the audio deepfake detection model (wav2vec2-based)
 
+    Safe to call from several threads (e.g. the startup background loader and a
+    request): the model is only loaded once.
+
     Returns:
         Loaded pipeline for audio classification or None if failed
     """
-    global _audio_pipeline, _audio_model_loaded
-
     if _audio_pipeline is not None:
         logger.info('[MODEL_LOADER] Audio model already loaded, returning cached instance')
         return _audio_pipeline
 
+    with _audio_load_lock:
+        if _audio_pipeline is not None:
+            return _audio_pipeline
+        return _load_audio_pipeline()
+
+
+def _load_audio_pipeline():
+    """
+    Load the audio pipeline (caller holds _audio_load_lock)
+
+    Like the image pipeline, it is only published to _audio_pipeline once it is
+    in eval mode and its label table is built, so request threads checking
+    _audio_pipeline without the lock never see a half-configured model.
+    """
+    global _audio_pipeline, _audio_model_loaded, _audio_model_backend, _audio_label_table
+
+    audio_pipeline = None
+
     try:
         device = get_device()
 
@@ -127,14 +739,28 @@ def load_audio_model():
 
         logger.info(f'[MODEL_LOADER] Loading audio model: {model_path}')
 
-        # Use audio-classification pipeline for wav2vec2 model
-        _audio_pipeline = pipeline(
-            "audio-classification",
-            model=model_path,
-            device=device
-        )
-
+        if MODEL_BACKEND == 'onnx' and ONNX_RUNTIME_AVAILABLE:
+            try:
+                audio_pipeline = _load_onnx_audio_pipeline(model_path, device)
+                _audio_model_backend = 'onnx'
+            except Exception as e:
+                logger.warning(f'[MODEL_LOADER] ONNX Runtime audio load failed, falling back to PyTorch: {str(e)}')
+
+        if audio_pipeline is None:
+            # Use audio-classification pipeline for wav2vec2 model
+            # (same precision as the image model; not compiled - clip lengths vary per request)
+            audio_pipeline = pipeline(
+                "audio-classification",
+                model=model_path,
+                device=device,
+                torch_dtype=get_model_dtype()
+            )
+            audio_pipeline.model.eval()
+            _audio_model_backend = 'torch'
+
+        _audio_label_table = _build_audio_label_table(audio_pipeline.model.config.id2label)
         _audio_model_loaded = True
+        _audio_pipeline = audio_pipeline
         logger.info('[MODEL_LOADER] Audio model loaded successfully')
         return _audio_pipeline
 
@@ -179,11 +805,16 @@ def get_model_info():
         'device': 'cuda' if get_device() >= 0 else 'cpu',
         'accuracy': '94.44%',
         'architecture': 'SiglIP-based binary classifier',
+        'backend': _model_backend,
+        'precision': 'int8' if _model_quantized else str(get_model_dtype()).replace('torch.', ''),
+        'compiled': _model_compiled,
+        'frozen': _model_frozen,
         # Audio model info
         'audio_model': audio_source,
         'audio_model_name': 'wav2vec2-large-xlsr-deepfake-audio-classification',
         'audio_model_id': AUDIO_MODEL_ID_HF,
         'audio_model_loaded': _audio_model_loaded and _audio_pipeline is not None,
+        'audio_backend': _audio_model_backend,
         'audio_accuracy': '92.86%',
         'audio_architecture': 'Wav2Vec2-XLS-R based binary classifier'
     }
@@ -3,13 +3,22 @@ Preprocessing Module
 Handles image preprocessing for the Hugging Face model
 """
 
+import io
 import os
+import hashlib
+import tempfile
+import cv2
+import numpy as np
 from PIL import Image, ImageOps
+from PIL.PngImagePlugin import PngInfo
 import logging
+from frame_cache import CacheSizeLimit
 
 # Import face detection module
 try:
-    from face_detection import detect_and_crop_face
+    from face_detection import (
+        detect_and_crop_face, detect_face_bbox, compute_crop_box, warmup_face_detector, get_detection_method
+    )
     FACE_DETECTION_AVAILABLE = True
 except ImportError:
     FACE_DETECTION_AVAILABLE = False
@@ -17,6 +26,134 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# EXIF Orientation tag
+EXIF_ORIENTATION = 0x0112
+
+# PREPROCESS_BUFFERED_READ: read image files with one sequential read before decoding
+# (helps frame directories on NFS/SMB mounts; files over 50 MB are always opened directly)
+PREPROCESS_BUFFERED_READ = os.environ.get('PREPROCESS_BUFFERED_READ', 'false').lower() == 'true'
+BUFFERED_READ_MAX_BYTES = 50 * 1024 * 1024
+
+# FRAME_SIMILARITY_THRESHOLD: mean absolute difference (0-255, 32x32 grayscale thumbnails)
+# below which a decoded video frame reuses the face box of the last detected frame, when its
+# crop region is that similar too (0 = detect on every frame)
+FRAME_SIMILARITY_THRESHOLD = float(os.environ.get('FRAME_SIMILARITY_THRESHOLD', 3.0))
+
+# JPEG_DRAFT_SIZE: large JPEGs are decoded at a reduced DCT scale (1/2, 1/4, 1/8) that
+# keeps both sides at or above this many pixels (0 = always decode at full resolution)
+JPEG_DRAFT_SIZE = int(os.environ.get('JPEG_DRAFT_SIZE', 1024))
+_REDUCED_IMREAD_FLAGS = {1: cv2.IMREAD_COLOR, 2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+
+# PREPROCESS_CACHE_DIR: directory for preprocessed (face-cropped) image files, keyed by
+# path + mtime + size (caching disabled if unset)
+PREPROCESS_CACHE_DIR = os.environ.get('PREPROCESS_CACHE_DIR', '')
+# PREPROCESS_CACHE_MAX_MB: size bound of PREPROCESS_CACHE_DIR (least recently used files are removed past it)
+PREPROCESS_CACHE_MAX_MB = float(os.environ.get('PREPROCESS_CACHE_MAX_MB', 1024))
+_preprocess_cache_limit = CacheSizeLimit(PREPROCESS_CACHE_DIR, PREPROCESS_CACHE_MAX_MB * 1024 * 1024, '[PREPROCESSING]')
+
+# Model input size (width, height) and resample filter, set by configure_target_size;
+# when set, crops are resized in the preprocessing threads instead of in the image processor
+_target_size = None
+_target_resample = Image.BICUBIC
+
+
+def configure_target_size(image_processor):
+    """
+    Resize preprocessed images to the model's input size
+
+    The HF image processor resizes every image of a batch on the inference
+    thread; doing it here moves that work onto the preprocessing pool, and the
+    processor's own resize of an already-sized image is a no-op.
+    Processors that do not resize to a fixed height/width are left alone.
+
+    Args:
+        image_processor: HF image processor of the loaded pipeline
+    """
+    global _target_size, _target_resample
+
+    size = getattr(image_processor, 'size', None) or {}
+    if not getattr(image_processor, 'do_resize', True) or 'height' not in size or 'width' not in size:
+        _target_size = None
+        return
+
+    _target_size = (size['width'], size['height'])
+    resample = getattr(image_processor, 'resample', None)
+    _target_resample = Image.Resampling(int(resample)) if resample is not None else Image.BICUBIC
+    logger.info(f'[PREPROCESSING] Resizing images to {_target_size[0]}x{_target_size[1]} during preprocessing')
+
+
+def _to_target_size(image):
+    """Resize a PIL Image to the configured model input size (if any)"""
+    if _target_size is None or image.size == _target_size:
+        return image
+    return image.resize(_target_size, _target_resample)
+
+
+def warmup_face_detection():
+    """Warm up the face detector of the calling thread (no-op without face detection)"""
+    if FACE_DETECTION_AVAILABLE:
+        warmup_face_detector()
+
+
+def _open_image(path):
+    """Open an image file, reading it into memory first when PREPROCESS_BUFFERED_READ is enabled"""
+    if PREPROCESS_BUFFERED_READ:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= BUFFERED_READ_MAX_BYTES:
+                return Image.open(io.BytesIO(f.read()))
+    return Image.open(path)
+
+
+def _jpeg_draft_scale(path):
+    """
+    Get the DCT scale a JPEG file can be decoded at (see JPEG_DRAFT_SIZE)
+
+    Only the header is parsed. Returns 1 for other formats, small images and
+    unreadable files.
+    """
+    if JPEG_DRAFT_SIZE <= 0:
+        return 1
+    try:
+        with Image.open(path) as header:
+            if header.format != 'JPEG':
+                return 1
+            min_side = min(header.size)
+    except Exception:
+        return 1
+
+    scale = 1
+    while scale < 8 and min_side // (scale * 2) >= JPEG_DRAFT_SIZE:
+        scale *= 2
+    return scale
+
+
+def _read_rgb_array(path):
+    """
+    Decode an image file straight to an RGB uint8 array with OpenCV
+
+    cv2.imread applies the EXIF orientation itself and decodes faster than PIL
+    (and without the PIL -> numpy copy face detection needs).
+
+    Returns:
+        numpy array (H, W, 3) or None if OpenCV cannot read the file
+    """
+    image = cv2.imread(path, _REDUCED_IMREAD_FLAGS[_jpeg_draft_scale(path)])
+    if image is None:
+        return None
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def _exif_transpose(image):
+    """Apply the EXIF orientation, returning the image itself (no copy) when it needs no rotation"""
+    if image.getexif().get(EXIF_ORIENTATION, 1) == 1:
+        return image
+    return ImageOps.exif_transpose(image)
+
+
+def _to_rgb(image):
+    """Convert to RGB, skipping the copy convert() makes when the image already is RGB"""
+    return image if image.mode == 'RGB' else image.convert('RGB')
+
 
 def load_image(image_input):
     """
@@ -33,22 +170,24 @@ def load_image(image_input):
     """
     try:
         if isinstance(image_input, str):
-            # File path
-            if not os.path.exists(image_input):
-                raise FileNotFoundError(f'Image file not found: {image_input}')
-            image = Image.open(image_input)
+            # File path (a missing file raises FileNotFoundError from open - no separate stat)
+            image = _open_image(image_input)
+            if image.format == 'JPEG' and JPEG_DRAFT_SIZE > 0:
+                # Let libjpeg decode large photos at a reduced scale
+                image.draft('RGB', (JPEG_DRAFT_SIZE, JPEG_DRAFT_SIZE))
+            # Decode now so errors surface here (and the file is closed)
+            image.load()
             # Apply EXIF rotation (critical for mobile photos)
-            image = ImageOps.exif_transpose(image)
-            image = image.convert('RGB')
+            image = _to_rgb(_exif_transpose(image))
         elif isinstance(image_input, Image.Image):
             # PIL Image - apply EXIF rotation if available
-            image = ImageOps.exif_transpose(image_input)
-            image = image.convert('RGB')
+            # (an upright RGB image is returned as is, without a copy)
+            image = _to_rgb(_exif_transpose(image_input))
         else:
             # Try to convert numpy array or other formats
             if hasattr(image_input, 'shape'):
                 # numpy array
-                image = Image.fromarray(image_input).convert('RGB')
+                image = _to_rgb(Image.fromarray(image_input))
             else:
                 raise ValueError(f'Unsupported image input type: {type(image_input)}')
 
@@ -59,6 +198,73 @@ def load_image(image_input):
         raise
 
 
+def get_preprocessing_signature(detect_faces=True):
+    """
+    Describe the settings that change the output of image preprocessing
+
+    Cache keys include it so a different configuration (face detector, model
+    input size / resample filter, JPEG draft size) is a miss.
+
+    Args:
+        detect_faces: Whether faces are cropped (default: True)
+
+    Returns:
+        str: Signature of the current preprocessing configuration
+    """
+    detection = get_detection_method() if detect_faces and FACE_DETECTION_AVAILABLE else 'off'
+    return f'{detection}|{_target_size}|{int(_target_resample)}|{JPEG_DRAFT_SIZE}'
+
+
+def _preprocess_cache_path(path, detect_faces):
+    """
+    Get the preprocess cache file for an image file
+
+    The key covers the file (path, mtime, size) and every setting that changes
+    the output, so an edited file or a different configuration is a miss.
+    """
+    stat = os.stat(path)
+    key = f'{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{get_preprocessing_signature(detect_faces)}'
+    return os.path.join(PREPROCESS_CACHE_DIR, f'{hashlib.sha1(key.encode()).hexdigest()}.png')
+
+
+def _load_preprocessed(cache_path):
+    """Load a cached preprocessed image as (PIL Image, face_detected) or None on a miss"""
+    try:
+        image = Image.open(cache_path)
+        image.load()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f'[PREPROCESSING] Ignoring unreadable cache entry {cache_path}: {str(e)}')
+        return None
+    _preprocess_cache_limit.touch(cache_path)
+    return image, image.text.get('face_detected') == '1'
+
+
+def _save_preprocessed(cache_path, image, face_detected):
+    """
+    Store a preprocessed image (lossless PNG, so a hit feeds the model the same pixels)
+
+    The file is written under a temporary name and renamed into place so
+    concurrent threads / workers never read a partial entry.
+    """
+    try:
+        os.makedirs(PREPROCESS_CACHE_DIR, exist_ok=True)
+        info = PngInfo()
+        info.add_text('face_detected', '1' if face_detected else '0')
+        fd, tmp_path = tempfile.mkstemp(dir=PREPROCESS_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                image.save(f, 'PNG', pnginfo=info, compress_level=1)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        _preprocess_cache_limit.add(os.path.getsize(cache_path))
+    except Exception as e:
+        logger.warning(f'[PREPROCESSING] Failed to cache preprocessed image: {str(e)}')
+
+
 def preprocess_image(image_input, detect_faces=True, return_face_info=False):
     """
     Preprocess a single image for model inference
@@ -76,9 +282,28 @@ def preprocess_image(image_input, detect_faces=True, return_face_info=False):
         If return_face_info=True: tuple (PIL Image, bool face_detected)
     """
     try:
-        # Load image
-        image = load_image(image_input)
+        cache_path = None
+        if PREPROCESS_CACHE_DIR and isinstance(image_input, str):
+            cache_path = _preprocess_cache_path(image_input, detect_faces)
+            cached = _load_preprocessed(cache_path)
+            if cached is not None:
+                return cached if return_face_info else cached[0]
+
         face_detected = False
+        if detect_faces and FACE_DETECTION_AVAILABLE and isinstance(image_input, str) and not PREPROCESS_BUFFERED_READ:
+            # Files OpenCV cannot decode (or that do not exist) fall through to PIL
+            image_array = _read_rgb_array(image_input)
+            if image_array is not None:
+                image_input = image_array
+
+        if (detect_faces and FACE_DETECTION_AVAILABLE and isinstance(image_input, np.ndarray)
+                and image_input.ndim == 3 and image_input.shape[2] == 3 and image_input.dtype == np.uint8):
+            # Raw RGB frame (decoded video / frame array): hand the array straight to
+            # face detection, only the crop is turned into a PIL Image
+            image = image_input
+        else:
+            # Load image
+            image = load_image(image_input)
 
         # Apply face detection if enabled and available
         if detect_faces and FACE_DETECTION_AVAILABLE:
@@ -86,12 +311,17 @@ def preprocess_image(image_input, detect_faces=True, return_face_info=False):
             face_detected = bbox is not None
             image = cropped_image
             if face_detected:
-                logger.debug(f'[PREPROCESSING] Face detection applied, bbox={bbox}')
+                logger.debug('[PREPROCESSING] Face detection applied, bbox=%s', bbox)
             else:
-                logger.warning('[PREPROCESSING] No face detected, using full image')
+                logger.debug('[PREPROCESSING] No face detected, using full image')
         elif detect_faces and not FACE_DETECTION_AVAILABLE:
             logger.warning('[PREPROCESSING] Face detection requested but not available')
 
+        image = _to_target_size(image)
+
+        if cache_path is not None:
+            _save_preprocessed(cache_path, image, face_detected)
+
         if return_face_info:
             return image, face_detected
         return image
@@ -101,36 +331,66 @@ def preprocess_image(image_input, detect_faces=True, return_face_info=False):
         raise
 
 
-def preprocess_batch(image_paths, detect_faces=True):
+def _safe_preprocess(path, detect_faces):
+    """Preprocess one image, returning (None, False) instead of raising on invalid input"""
+    try:
+        return preprocess_image(path, detect_faces=detect_faces, return_face_info=True)
+    except Exception as e:
+        logger.warning(f'[PREPROCESSING] Skipping invalid image {path}: {str(e)}')
+        return None, False
+
+
+def _log_missing_faces(missing, total):
+    """Log one warning for the images of a batch where no face was found (instead of one per image)"""
+    if missing:
+        logger.warning('[PREPROCESSING] No face detected in %d of %d images, using full images', missing, total)
+
+
+def preprocess_batch(image_paths, detect_faces=True, executor=None, return_face_info=False):
     """
     Preprocess a batch of images for model inference
 
     Args:
         image_paths: List of image file paths
         detect_faces: If True, detect and crop faces before preprocessing (default: True)
+        executor: Optional concurrent.futures executor to preprocess images in parallel
+            (decode and face detection release the GIL); order is preserved
+        return_face_info: If True, also return a face-detected flag per image (default: False)
 
     Returns:
         List of PIL Images and list of valid paths
+        If return_face_info=True: also list of bool face_detected flags
     """
     try:
         if not image_paths:
             raise ValueError('Empty image paths list')
 
+        if executor is not None:
+            processed = list(executor.map(lambda path: _safe_preprocess(path, detect_faces), image_paths))
+        else:
+            processed = [_safe_preprocess(path, detect_faces) for path in image_paths]
+
         images = []
         valid_paths = []
+        face_flags = []
 
-        for path in image_paths:
-            try:
-                image = preprocess_image(path, detect_faces=detect_faces)
+        for path, (image, face_detected) in zip(image_paths, processed):
+            if image is not None:
                 images.append(image)
                 valid_paths.append(path)
-            except Exception as e:
-                logger.warning(f'[PREPROCESSING] Skipping invalid image {path}: {str(e)}')
-                continue
+                face_flags.append(face_detected)
 
         if not images:
             raise ValueError('No valid images found in batch')
 
+        skipped = len(image_paths) - len(images)
+        if skipped:
+            logger.warning(f'[PREPROCESSING] Skipped {skipped} of {len(image_paths)} missing or invalid images')
+        if detect_faces:
+            _log_missing_faces(face_flags.count(False), len(face_flags))
+
+        if return_face_info:
+            return images, valid_paths, face_flags
         return images, valid_paths
 
     except Exception as e:
@@ -138,7 +398,28 @@ def preprocess_batch(image_paths, detect_faces=True):
         raise
 
 
-def preprocess_frames(frame_paths, max_frames=None, detect_faces=True):
+def sample_frame_paths(frame_paths, max_frames=None):
+    """
+    Sample frame paths evenly down to max_frames
+
+    Args:
+        frame_paths: List of frame file paths
+        max_frames: Maximum number of frames to keep (None = all)
+
+    Returns:
+        List of sampled frame paths
+    """
+    if max_frames and len(frame_paths) > max_frames:
+        # Sample frames evenly from first to last (a fixed step would leave
+        # the tail of the video out whenever the count is not a multiple)
+        indices = np.linspace(0, len(frame_paths) - 1, max_frames).round().astype(int)
+        sampled = [frame_paths[i] for i in indices]
+        logger.info(f'[PREPROCESSING] Sampling {len(sampled)} frames from {len(frame_paths)} total')
+        frame_paths = sampled
+    return frame_paths
+
+
+def preprocess_frames(frame_paths, max_frames=None, detect_faces=True, executor=None, return_face_info=False):
     """
     Preprocess video frames for inference
 
@@ -146,27 +427,322 @@ def preprocess_frames(frame_paths, max_frames=None, detect_faces=True):
         frame_paths: List of frame file paths
         max_frames: Maximum number of frames to process (None = all)
         detect_faces: If True, detect and crop faces before preprocessing (default: True)
+        executor: Optional concurrent.futures executor to preprocess frames in parallel
+        return_face_info: If True, also return a face-detected flag per frame (default: False)
 
     Returns:
         List of PIL Images and list of processed frame paths
+        If return_face_info=True: also list of bool face_detected flags
     """
     try:
         if not frame_paths:
             logger.warning('[PREPROCESSING] No frame paths provided')
-            return [], []
+            return ([], [], []) if return_face_info else ([], [])
 
         # Limit number of frames if specified
-        if max_frames and len(frame_paths) > max_frames:
-            # Sample frames evenly
-            step = len(frame_paths) // max_frames
-            frame_paths = frame_paths[::step][:max_frames]
-            logger.info(f'[PREPROCESSING] Sampling {len(frame_paths)} frames')
+        frame_paths = sample_frame_paths(frame_paths, max_frames)
 
         # Preprocess batch
-        images, valid_paths = preprocess_batch(frame_paths, detect_faces=detect_faces)
-
-        return images, valid_paths
+        return preprocess_batch(
+            frame_paths,
+            detect_faces=detect_faces,
+            executor=executor,
+            return_face_info=return_face_info
+        )
 
     except Exception as e:
         logger.error(f'[PREPROCESSING] Error preprocessing frames: {str(e)}')
         raise
+
+
+def iter_preprocessed_frames(frame_paths, max_frames=None, detect_faces=True, executor=None, chunk_size=16):
+    """
+    Preprocess video frames and yield them in chunks as soon as each chunk is ready
+
+    With an executor every frame is submitted up front, so the caller can run
+    inference on one chunk while the following frames are still being decoded
+    and face-cropped.
+
+    Args:
+        frame_paths: List of frame file paths
+        max_frames: Maximum number of frames to process (None = all)
+        detect_faces: If True, detect and crop faces before preprocessing (default: True)
+        executor: Optional concurrent.futures executor to preprocess frames in parallel
+        chunk_size: Number of valid frames per yielded chunk (default: 16)
+
+    Yields:
+        tuple: (list of PIL Images, list of frame paths, list of bool face_detected flags)
+    """
+    frame_paths = sample_frame_paths(frame_paths, max_frames)
+
+    if executor is not None:
+        processed = executor.map(lambda path: _safe_preprocess(path, detect_faces), frame_paths)
+    else:
+        processed = (_safe_preprocess(path, detect_faces) for path in frame_paths)
+
+    images = []
+    valid_paths = []
+    face_flags = []
+    total = 0
+    faces = 0
+
+    for path, (image, face_detected) in zip(frame_paths, processed):
+        if image is None:
+            continue
+        images.append(image)
+        valid_paths.append(path)
+        face_flags.append(face_detected)
+
+        if len(images) == chunk_size:
+            total += len(images)
+            faces += sum(face_flags)
+            yield images, valid_paths, face_flags
+            images, valid_paths, face_flags = [], [], []
+
+    if images:
+        total += len(images)
+        faces += sum(face_flags)
+        yield images, valid_paths, face_flags
+
+    skipped = len(frame_paths) - total
+    if skipped:
+        logger.warning(f'[PREPROCESSING] Skipped {skipped} of {len(frame_paths)} missing or invalid frames')
+    if detect_faces:
+        _log_missing_faces(total - faces, total)
+
+
+def decode_video_frames(video_path, max_frames=None):
+    """
+    Decode evenly spaced frames straight from a video file (FFmpeg via OpenCV)
+
+    Frames that are not sampled are only grabbed (demuxed/decoded without color
+    conversion or copying), and no intermediate frame files are written.
+
+    Args:
+        video_path: Path to the video file
+        max_frames: Maximum number of frames to decode (None = all)
+
+    Returns:
+        List of RGB numpy arrays and list of their frame indices
+    """
+    capture = cv2.VideoCapture(video_path)
+    if not capture.isOpened():
+        raise ValueError(f'Could not open video: {video_path}')
+
+    try:
+        total = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total > 0:
+            wanted = set(sample_frame_paths(list(range(total)), max_frames))
+            last_wanted = max(wanted)
+        else:
+            # Container does not report a frame count - decode everything, sample afterwards
+            wanted = None
+            last_wanted = None
+
+        frames = []
+        indices = []
+        index = 0
+        while last_wanted is None or index <= last_wanted:
+            if not capture.grab():
+                break
+            if wanted is None or index in wanted:
+                ok, frame = capture.retrieve()
+                if ok:
+                    frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                    indices.append(index)
+            index += 1
+    finally:
+        capture.release()
+
+    if wanted is None and max_frames and len(frames) > max_frames:
+        keep = sample_frame_paths(list(range(len(frames))), max_frames)
+        frames = [frames[i] for i in keep]
+        indices = [indices[i] for i in keep]
+
+    logger.info(f'[PREPROCESSING] Decoded {len(frames)} frames from {video_path}')
+    return frames, indices
+
+
+def _safe_detect_face(frame):
+    """Detect the largest face in an RGB frame, returning None instead of raising"""
+    try:
+        return detect_face_bbox(frame)
+    except Exception as e:
+        logger.warning(f'[PREPROCESSING] Face detection failed: {str(e)}')
+        return None
+
+
+def _thumbnail(rgb):
+    """Get the 32x32 grayscale thumbnail frames are compared with"""
+    gray = cv2.cvtColor(np.ascontiguousarray(rgb), cv2.COLOR_RGB2GRAY)
+    return cv2.resize(gray, (32, 32), interpolation=cv2.INTER_AREA).astype(np.int16)
+
+
+def _detect_faces(frames, executor):
+    """Run _safe_detect_face on frames, in parallel when an executor is given"""
+    if executor is not None:
+        return list(executor.map(_safe_detect_face, frames))
+    return [_safe_detect_face(frame) for frame in frames]
+
+
+def _crop_similar_frames(frames, executor):
+    """
+    Face-crop decoded RGB frames, running detection only on frames that changed
+
+    Each frame is compared with the last frame that went through detection
+    (mean absolute difference of 32x32 grayscale thumbnails); frames below
+    FRAME_SIMILARITY_THRESHOLD reuse that frame's face box. A whole-frame
+    thumbnail barely changes when a small face moves, so before reusing a box
+    the crop region itself is compared too, and frames whose crop changed get
+    their own detection.
+
+    Returns:
+        List of (PIL Image, face_detected) tuples, one per frame
+    """
+    owners = []
+    key_thumb = None
+    key_index = -1
+    for index, frame in enumerate(frames):
+        thumb = _thumbnail(frame)
+        if key_thumb is None or np.abs(thumb - key_thumb).mean() >= FRAME_SIMILARITY_THRESHOLD:
+            key_thumb = thumb
+            key_index = index
+        owners.append(key_index)
+
+    keys = sorted(set(owners))
+    bboxes = dict(zip(keys, _detect_faces([frames[index] for index in keys], executor)))
+
+    # Crop boxes of the key frames and thumbnails of the region they cover
+    crop_boxes = {}
+    crop_thumbs = {}
+    for index in keys:
+        if bboxes[index] is not None:
+            img_h, img_w = frames[index].shape[:2]
+            crop_boxes[index] = compute_crop_box(bboxes[index], img_w, img_h)
+            x1, y1, x2, y2 = crop_boxes[index]
+            crop_thumbs[index] = _thumbnail(frames[index][y1:y2, x1:x2])
+
+    frame_boxes = [crop_boxes.get(owner) for owner in owners]
+    redetect = []
+    for index, (frame, owner) in enumerate(zip(frames, owners)):
+        if owner == index or owner not in crop_boxes:
+            continue
+        x1, y1, x2, y2 = crop_boxes[owner]
+        if np.abs(_thumbnail(frame[y1:y2, x1:x2]) - crop_thumbs[owner]).mean() >= FRAME_SIMILARITY_THRESHOLD:
+            redetect.append(index)
+
+    for index, face_bbox in zip(redetect, _detect_faces([frames[index] for index in redetect], executor)):
+        if face_bbox is None:
+            frame_boxes[index] = None
+        else:
+            img_h, img_w = frames[index].shape[:2]
+            frame_boxes[index] = compute_crop_box(face_bbox, img_w, img_h)
+    logger.debug(f'[PREPROCESSING] Face detection ran on {len(keys) + len(redetect)} of {len(frames)} frames')
+
+    processed = []
+    for frame, crop_box in zip(frames, frame_boxes):
+        if crop_box is None:
+            processed.append((_to_target_size(Image.fromarray(frame)), False))
+            continue
+        x1, y1, x2, y2 = crop_box
+        processed.append((_to_target_size(Image.fromarray(frame[y1:y2, x1:x2])), True))
+
+    return processed
+
+
+def _preprocess_frame_arrays(frames, indices, detect_faces, executor, return_face_info):
+    """Face-crop already decoded RGB frames, dropping the ones that fail"""
+    if detect_faces and FACE_DETECTION_AVAILABLE and FRAME_SIMILARITY_THRESHOLD > 0 and frames:
+        processed = _crop_similar_frames(frames, executor)
+    elif executor is not None:
+        processed = list(executor.map(lambda frame: _safe_preprocess(frame, detect_faces), frames))
+    else:
+        processed = [_safe_preprocess(frame, detect_faces) for frame in frames]
+
+    images = []
+    valid_indices = []
+    face_flags = []
+
+    for index, (image, face_detected) in zip(indices, processed):
+        if image is not None:
+            images.append(image)
+            valid_indices.append(index)
+            face_flags.append(face_detected)
+
+    if detect_faces:
+        _log_missing_faces(face_flags.count(False), len(face_flags))
+
+    if return_face_info:
+        return images, valid_indices, face_flags
+    return images, valid_indices
+
+
+def preprocess_video(video_path, max_frames=None, detect_faces=True, executor=None, return_face_info=False):
+    """
+    Decode and preprocess frames directly from a video file
+
+    Args:
+        video_path: Path to the video file
+        max_frames: Maximum number of frames to process (None = all)
+        detect_faces: If True, detect and crop faces before preprocessing (default: True)
+        executor: Optional concurrent.futures executor to preprocess frames in parallel
+        return_face_info: If True, also return a face-detected flag per frame (default: False)
+
+    Returns:
+        List of PIL Images and list of processed frame indices
+        If return_face_info=True: also list of bool face_detected flags
+    """
+    try:
+        frames, indices = decode_video_frames(video_path, max_frames=max_frames)
+        if not frames:
+            logger.warning(f'[PREPROCESSING] No frames decoded from {video_path}')
+            return ([], [], []) if return_face_info else ([], [])
+
+        return _preprocess_frame_arrays(frames, indices, detect_faces, executor, return_face_info)
+
+    except Exception as e:
+        logger.error(f'[PREPROCESSING] Error preprocessing video: {str(e)}')
+        raise
+
+
+def load_frame_array(array_path, max_frames=None):
+    """
+    Memory-map a stacked uint8 frame array saved with numpy (e.g. an .npy in /dev/shm)
+
+    Args:
+        array_path: Path to an .npy file of shape (N, H, W, 3), RGB uint8
+        max_frames: Maximum number of frames to keep (None = all)
+
+    Returns:
+        List of RGB numpy arrays (views into the mapping) and list of their frame indices
+    """
+    frames = np.load(array_path, mmap_mode='r')
+    if frames.ndim != 4 or frames.shape[-1] != 3 or frames.dtype != np.uint8:
+        raise ValueError(f'Expected a (N, H, W, 3) uint8 frame array, got {frames.shape} {frames.dtype}')
+
+    indices = sample_frame_paths(list(range(len(frames))), max_frames)
+    return [np.asarray(frames[index]) for index in indices], indices
+
+
+def preprocess_frame_array(array_path, max_frames=None, detect_faces=True, executor=None, return_face_info=False):
+    """
+    Preprocess frames handed over as one raw array instead of encoded frame files
+
+    Args:
+        array_path: Path to an .npy file of shape (N, H, W, 3), RGB uint8
+        max_frames: Maximum number of frames to process (None = all)
+        detect_faces: If True, detect and crop faces before preprocessing (default: True)
+        executor: Optional concurrent.futures executor to preprocess frames in parallel
+        return_face_info: If True, also return a face-detected flag per frame (default: False)
+
+    Returns:
+        List of PIL Images and list of processed frame indices
+        If return_face_info=True: also list of bool face_detected flags
+    """
+    try:
+        frames, indices = load_frame_array(array_path, max_frames=max_frames)
+        return _preprocess_frame_arrays(frames, indices, detect_faces, executor, return_face_info)
+
+    except Exception as e:
+        logger.error(f'[PREPROCESSING] Error preprocessing frame array: {str(e)}')
+        raise